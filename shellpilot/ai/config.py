@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, Literal, Tuple
+from typing import Any, Dict, Literal, Optional, Tuple
 import json
 import os
 
@@ -31,7 +31,29 @@ DEFAULT_CONFIG: Dict[str, Any] = {
 }
 
 
+# ((mtime_ns, size) of ai.json, parsed config); see load_ai_config
+_config_cache: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+
+
 def load_ai_config() -> Dict[str, Any]:
+    """
+    Return the AI config (defaults overlaid with ai.json).
+
+    The parsed file is reused until its mtime/size change, so the AI paths
+    that consult settings on every request don't re-read it each time.
+    Callers get their own copy and may modify it.
+    """
+    global _config_cache
+    try:
+        st = CONFIG_PATH.stat()
+    except OSError:
+        return DEFAULT_CONFIG.copy()
+
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _config_cache
+    if cached is not None and cached[0] == sig:
+        return cached[1].copy()
+
     cfg = DEFAULT_CONFIG.copy()
     try:
         if CONFIG_PATH.is_file():
@@ -41,13 +63,21 @@ def load_ai_config() -> Dict[str, Any]:
     except Exception:
         # Corrupt/invalid config → ignore and use defaults
         pass
-    return cfg
+    _config_cache = (sig, cfg)
+    return cfg.copy()
 
 
 def save_ai_config(cfg: Dict[str, Any]) -> None:
+    global _config_cache
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     tmp = CONFIG_PATH.with_suffix(".tmp")
-    tmp.write_text(json.dumps(cfg, indent=2), encoding="utf-8")
+    payload = json.dumps(cfg, indent=2).encode("utf-8")
+    # Created 0600 up front: API keys are never readable by others, even briefly
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, payload)
+    finally:
+        os.close(fd)
     tmp.replace(CONFIG_PATH)
     try:
         os.chmod(CONFIG_PATH, 0o600)
@@ -55,6 +85,17 @@ def save_ai_config(cfg: Dict[str, Any]) -> None:
         # Non-POSIX / weird FS – best effort only
         pass
 
+    # Write-through: the next load_ai_config() (usually right away, on the
+    # UI thread) is served from memory instead of re-reading this file
+    try:
+        st = CONFIG_PATH.stat()
+    except OSError:
+        _config_cache = None
+        return
+    merged = DEFAULT_CONFIG.copy()
+    merged.update(cfg)
+    _config_cache = ((st.st_mtime_ns, st.st_size), merged)
+
 
 def set_provider_and_key(
     provider: Provider,
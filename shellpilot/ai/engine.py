@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Iterator, Optional
+import errno
 import os
+import re
+import threading
 import urllib.request  # needed for download_model
-import urllib.request
 import urllib.error
 from llama_cpp import Llama
 
@@ -42,6 +45,154 @@ Your role:
 You are talking to a technically capable user (often a senior Linux engineer), but you should still be clear and structured in your explanations.
 """
 
+# Model downloads are fetched as byte ranges of this size, this many at once
+_DOWNLOAD_CHUNK_BYTES = 16 * 1024 * 1024
+_DOWNLOAD_CONNECTIONS = 4
+_DOWNLOAD_READ_BYTES = 1024 * 1024
+# Ask the kernel to drop written pages from the page cache this often, so a
+# multi-GB model doesn't push everything else out of memory
+_DOWNLOAD_EVICT_BYTES = 64 * 1024 * 1024
+
+_CONTENT_RANGE_TOTAL = re.compile(r"bytes\s+\d+-\d+/(\d+)")
+
+
+def _copy_body(resp, fd: int, offset: int, advance: Callable[[int], None]) -> int:
+    """Write a response body into fd starting at offset; return bytes written."""
+    # One reusable buffer per body instead of a fresh 1 MiB bytes per read
+    buf = bytearray(_DOWNLOAD_READ_BYTES)
+    view = memoryview(buf)
+    written = 0
+    while True:
+        n = resp.readinto(buf)
+        if not n:
+            return written
+        chunk = view[:n]
+        while chunk:
+            # pwrite may write less than asked (e.g. on a signal)
+            done = os.pwrite(fd, chunk, offset + written)
+            written += done
+            chunk = chunk[done:]
+        advance(n)
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Reserve size bytes for fd up front, so a full disk fails the download early."""
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except AttributeError:
+        # No posix_fallocate (macOS): just set the length
+        os.ftruncate(fd, size)
+    except OSError as exc:
+        if exc.errno not in (errno.EOPNOTSUPP, errno.EINVAL, errno.ENOSYS):
+            raise
+        os.ftruncate(fd, size)
+
+
+def _evict_written(fd: int) -> None:
+    """Drop fd's clean pages from the page cache; dirty ones start writeback."""
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except (AttributeError, OSError):
+        pass
+
+
+def _download_ranges(
+    url: str,
+    headers: dict[str, str],
+    dest: Path,
+    progress_cb: Optional[Callable[[int, int], None]] = None,
+) -> None:
+    """
+    Fetch url into dest, in parallel byte ranges when the server allows it.
+
+    The first range request doubles as the probe: a 206 reply carries the
+    total size and the final (post-redirect) URL, and the remaining ranges
+    are fetched over _DOWNLOAD_CONNECTIONS connections and written in place
+    with os.pwrite. A plain 200 reply means ranges aren't supported, so the
+    body is streamed in order instead; a 206 that doesn't state the total
+    size is dropped and the whole file is requested without a Range.
+    """
+    lock = threading.Lock()
+    done = 0
+    total = 0
+    evicted_at = 0
+
+    def advance(n: int) -> None:
+        nonlocal done, evicted_at
+        with lock:
+            done += n
+            current = done
+            evict = current - evicted_at >= _DOWNLOAD_EVICT_BYTES
+            if evict:
+                evicted_at = current
+        if evict:
+            _evict_written(fd)
+        if progress_cb and total:
+            progress_cb(current, total)
+
+    def stream_all(resp: Any) -> None:
+        # No range support: one sequential stream, as before
+        nonlocal total
+        total = getattr(resp, "length", None) or 0
+        if total:
+            _preallocate(fd, total)
+        written = _copy_body(resp, fd, 0, advance)
+        if total and written != total:
+            # Don't leave a preallocated, zero-padded file behind
+            raise RuntimeError("Model download was cut short; please retry.")
+
+    first = urllib.request.Request(
+        url, headers={**headers, "Range": f"bytes=0-{_DOWNLOAD_CHUNK_BYTES - 1}"}
+    )
+    fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        with urllib.request.urlopen(first) as resp:
+            if resp.status != 206:
+                stream_all(resp)
+                return
+            match = _CONTENT_RANGE_TOTAL.match(resp.headers.get("Content-Range", ""))
+            if match is not None:
+                total = int(match.group(1))
+                final_url = resp.geturl()
+                _preallocate(fd, total)
+                # A dropped connection reads short without raising: don't leave
+                # a zero-filled hole in the preallocated file
+                if _copy_body(resp, fd, 0, advance) != min(_DOWNLOAD_CHUNK_BYTES, total):
+                    raise RuntimeError("Model download was cut short; please retry.")
+
+        if match is None:
+            # A partial reply without a usable total (e.g. "bytes 0-N/*"): its
+            # length is only the first chunk's, so fetch the whole file instead
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as resp:
+                if resp.status != 200:
+                    raise RuntimeError(
+                        f"Unexpected HTTP {resp.status} while downloading the model."
+                    )
+                stream_all(resp)
+            return
+
+        def fetch(lo: int) -> None:
+            hi = min(lo + _DOWNLOAD_CHUNK_BYTES, total) - 1
+            req = urllib.request.Request(
+                final_url, headers={**headers, "Range": f"bytes={lo}-{hi}"}
+            )
+            with urllib.request.urlopen(req) as resp:
+                if resp.status != 206:
+                    raise RuntimeError("Server stopped honouring byte-range requests.")
+                if _copy_body(resp, fd, lo, advance) != hi - lo + 1:
+                    raise RuntimeError("Model download was cut short; please retry.")
+
+        pool = ThreadPoolExecutor(max_workers=_DOWNLOAD_CONNECTIONS)
+        try:
+            # Iterating re-raises the first failure; pending ranges are dropped
+            for _ in pool.map(fetch, range(_DOWNLOAD_CHUNK_BYTES, total, _DOWNLOAD_CHUNK_BYTES)):
+                pass
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+    finally:
+        os.close(fd)
+
+
 class AIEngine:
     """
     Thin wrapper around llama-cpp for ShellPilot.
@@ -124,6 +275,16 @@ class AIEngine:
             n_gpu_layers=0,
         )
 
+    def _ensure_llm(self) -> Llama:
+        """Lazily load the model the first time we actually need it."""
+        if self._llm is None:
+            if not self.model_path.is_file():
+                raise FileNotFoundError(
+                    f"AI model '{self.model_spec.name}' not found at {self.model_path}."
+                )
+            self._llm = self._create_llm()
+        return self._llm
+
     def _run(
         self,
         prompt: str,
@@ -133,15 +294,7 @@ class AIEngine:
         """
         Call the model with a plain prompt and return the text output.
         """
-        # Lazily load the model the first time we actually need it
-        if self._llm is None:
-            if not self.model_path.is_file():
-                raise FileNotFoundError(
-                    f"AI model '{self.model_spec.name}' not found at {self.model_path}."
-                )
-            self._llm = self._create_llm()
-
-        result = self._llm(
+        result = self._ensure_llm()(
             prompt,
             max_tokens=max_tokens,
             temperature=temperature,
@@ -154,6 +307,30 @@ class AIEngine:
         text = result["choices"][0]["text"]
         return text.strip()
 
+    def _run_stream(
+        self,
+        prompt: str,
+        max_tokens: int = 2048,
+        temperature: float = 0.15,
+    ) -> Iterator[str]:
+        """
+        Like `_run`, but yield text chunks as the model generates them.
+        """
+        chunks = self._ensure_llm()(
+            prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            top_k=40,
+            top_p=0.9,
+            repeat_penalty=1.1,
+            stop=["</s>", "<|end|>", "<|endoftext|>"],
+            stream=True,
+        )
+        for chunk in chunks:
+            text = chunk["choices"][0]["text"]
+            if text:
+                yield text
+
     # ---------- Public helpers ----------
 
     def download_model(self, progress_cb=None) -> None:
@@ -180,24 +357,12 @@ class AIEngine:
             or load_config().hf_token
         )
 
-        req = urllib.request.Request(url)
+        headers: dict[str, str] = {}
         if token and "huggingface.co" in url:
-            req.add_header("Authorization", f"Bearer {token}")
+            headers["Authorization"] = f"Bearer {token}"
 
         try:
-            with urllib.request.urlopen(req) as resp, open(tmp_path, "wb") as out:
-                total = getattr(resp, "length", None) or 0
-                downloaded = 0
-
-                while True:
-                    chunk = resp.read(1024 * 1024)
-                    if not chunk:
-                        break
-                    out.write(chunk)
-                    downloaded += len(chunk)
-                    if progress_cb and total:
-                        progress_cb(downloaded, total)
-
+            _download_ranges(url, headers, tmp_path, progress_cb)
             tmp_path.rename(self.model_path)
 
         except urllib.error.HTTPError as e:
@@ -235,11 +400,8 @@ class AIEngine:
         # Let the old Llama instance get GC'd
         self._llm = self._create_llm()
 
-    def analyze_file(self, path: Path, content: str) -> str:
-        """
-        Explain what a file is, what it's used for, and any obvious issues.
-        Designed for logs, configs, scripts, etc.
-        """
+    def _file_prompt(self, path: Path, content: str) -> str:
+        """Build the SENTRA prompt used by `analyze_file` / `analyze_file_stream`."""
         # Keep prompt size under control for huge files
         snippet = content
         max_chars = 16000   # was 8000 – allow ~2x more context
@@ -247,7 +409,7 @@ class AIEngine:
             snippet = snippet[:max_chars]
             snippet += "\n\n[... truncated by ShellPilot for length ...]\n"
 
-        prompt = (
+        return (
             SENTRA_SYSTEM_PROMPT
             + "\nYou are currently helping the user understand a single file on a Linux system from inside ShellPilot.\n\n"
             "User environment:\n"
@@ -269,14 +431,24 @@ class AIEngine:
             "- A \"Next steps:\" section with 2–3 bullets.\n"
         )
 
+    def analyze_file(self, path: Path, content: str) -> str:
+        """
+        Explain what a file is, what it's used for, and any obvious issues.
+        Designed for logs, configs, scripts, etc.
+        """
+        prompt = self._file_prompt(path, content)
         return self._run(prompt, max_tokens=1024, temperature=0.15)
 
-    def analyze_directory(self, path: Path, manifest: str) -> str:
+    def analyze_file_stream(self, path: Path, content: str) -> Iterator[str]:
         """
-        Ask the model to explain what this directory is, surface anything suspicious,
-        and suggest next investigation commands. Returns Markdown.
+        Streaming variant of `analyze_file`: yields the answer as it is generated.
         """
-        prompt = (
+        prompt = self._file_prompt(path, content)
+        return self._run_stream(prompt, max_tokens=1024, temperature=0.15)
+
+    def _directory_prompt(self, path: Path, manifest: str) -> str:
+        """Build the prompt used by `analyze_directory` / `analyze_directory_stream`."""
+        return (
             "You are a senior Linux systems engineer and security analyst. "
             "You are given a non-recursive manifest of a directory on disk.\n"
             "Each entry may include:\n"
@@ -305,8 +477,21 @@ class AIEngine:
             "Format your answer in Markdown with clear headings, bullet lists, and fenced code blocks for shell commands.\n"
         )
 
+    def analyze_directory(self, path: Path, manifest: str) -> str:
+        """
+        Ask the model to explain what this directory is, surface anything suspicious,
+        and suggest next investigation commands. Returns Markdown.
+        """
+        prompt = self._directory_prompt(path, manifest)
         return self._run(prompt, max_tokens=2048, temperature=0.2)
 
+    def analyze_directory_stream(self, path: Path, manifest: str) -> Iterator[str]:
+        """
+        Streaming variant of `analyze_directory`: yields the answer as it is generated.
+        """
+        prompt = self._directory_prompt(path, manifest)
+        return self._run_stream(prompt, max_tokens=2048, temperature=0.2)
+
     def ask(self, question: str, context: Optional[str] = None) -> str:
         """
         Generic Q&A helper the rest of the app can use.
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import subprocess
+from functools import lru_cache
 from typing import NamedTuple, Optional
 
 
@@ -10,10 +11,14 @@ class GPUInfo(NamedTuple):
     memory_mb: int
 
 
+@lru_cache(maxsize=1)
 def detect_nvidia_gpu(timeout: float = 2.0) -> Optional[GPUInfo]:
     """
     Detect an NVIDIA GPU using `nvidia-smi`.
 
+    The result is cached: GPUs don't come and go during a session, and both
+    the UI and the AI engine ask.
+
     Returns:
         GPUInfo if at least one NVIDIA GPU is detected, otherwise None.
     """
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Set
 import json
 import os
 import urllib.request
@@ -113,3 +113,31 @@ def get_model_path(model_id: str) -> Path:
     _ensure_models_loaded()
     spec = AI_MODEL_REGISTRY[model_id]
     return BASE_MODELS_DIR / spec.subdir / spec.filename
+
+
+def get_installed_model_ids() -> Set[str]:
+    """
+    Return the ids of registry models whose GGUF file is on disk.
+
+    Lists each model subdirectory once instead of stat()ing every model.
+    """
+    _ensure_models_loaded()
+    listings: Dict[str, Set[str]] = {}
+    installed: Set[str] = set()
+    for model_id, spec in AI_MODEL_REGISTRY.items():
+        if "/" in spec.filename:
+            # Nested filename: not covered by the subdir listing
+            if get_model_path(model_id).is_file():
+                installed.add(model_id)
+            continue
+        names = listings.get(spec.subdir)
+        if names is None:
+            try:
+                with os.scandir(BASE_MODELS_DIR / spec.subdir) as it:
+                    names = {entry.name for entry in it if entry.is_file()}
+            except OSError:
+                names = set()
+            listings[spec.subdir] = names
+        if spec.filename in names:
+            installed.add(model_id)
+    return installed
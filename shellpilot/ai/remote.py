@@ -5,6 +5,8 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Literal
 import os
+import threading
+import time
 import requests
 from requests import HTTPError
 from shellpilot.ai.config import load_ai_config, get_effective_ai_settings
@@ -14,6 +16,54 @@ ProviderType = Literal["gpt", "gemini", "copilot", "selfhost"]
 class RemoteAIError(RuntimeError):
     pass
 
+class RemoteAICancelled(RemoteAIError):
+    """The job was cancelled while waiting to retry a rate-limited request."""
+
+# One keep-alive session for all providers: repeat requests to the same
+# host reuse the TCP/TLS connection instead of handshaking every time
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+def _http() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+        return _session
+
+# Rate-limited (429) or overloaded (503) replies are retried this many times,
+# waiting for the server's Retry-After (capped) or an exponential backoff
+_RATE_LIMIT_RETRIES = 2
+_RATE_LIMIT_MAX_WAIT = 20.0
+
+def _post(
+    url: str, cancel: threading.Event | None = None, **kwargs
+) -> requests.Response:
+    """
+    POST through the shared session, backing off when rate limited.
+
+    The backoff waits on cancel, so a cancelled or superseded job gives up
+    the AI worker at once instead of sleeping out the Retry-After.
+    """
+    delay = 2.0
+    for attempt in range(_RATE_LIMIT_RETRIES + 1):
+        resp = _http().post(url, **kwargs)
+        if resp.status_code not in (429, 503) or attempt == _RATE_LIMIT_RETRIES:
+            return resp
+        try:
+            wait = float(resp.headers.get("Retry-After", delay))
+        except ValueError:
+            # HTTP-date form: fall back to our own backoff
+            wait = delay
+        resp.close()
+        wait = min(max(wait, 0.0), _RATE_LIMIT_MAX_WAIT)
+        if cancel is None:
+            time.sleep(wait)
+        elif cancel.wait(wait):
+            raise RemoteAICancelled("Request cancelled.")
+        delay *= 2
+    return resp
+
 def _build_file_prompt(path: Path, content: str) -> str:
     # Mirror the semantics of AIEngine.analyze_file
     return (
@@ -62,7 +112,7 @@ def _build_dir_prompt(path: Path, manifest: str) -> str:
 
 # -------------------- OpenAI GPT --------------------
 
-def _call_openai(prompt: str) -> str:
+def _call_openai(prompt: str, cancel: threading.Event | None = None) -> str:
     cfg = load_ai_config()
     key = cfg.get("openai_api_key")
     if not key:
@@ -91,7 +141,7 @@ def _call_openai(prompt: str) -> str:
     }
 
     try:
-        resp = requests.post(endpoint, headers=headers, json=body, timeout=90)
+        resp = _post(endpoint, cancel, headers=headers, json=body, timeout=90)
         # Instead of raw raise_for_status, give a nicer message:
         if resp.status_code >= 400:
             try:
@@ -100,6 +150,8 @@ def _call_openai(prompt: str) -> str:
             except Exception:
                 msg = resp.text
             raise RemoteAIError(f"OpenAI error {resp.status_code}: {msg}")
+    except RemoteAICancelled:
+        raise
     except HTTPError as exc:
         # Fallback, just in case
         raise RemoteAIError(f"OpenAI HTTP error: {exc}") from exc
@@ -114,7 +166,7 @@ def _call_openai(prompt: str) -> str:
 
 # -------------------- Google Gemini --------------------
 
-def _call_gemini(prompt: str) -> str:
+def _call_gemini(prompt: str, cancel: threading.Event | None = None) -> str:
     cfg = load_ai_config()
     key = cfg.get("gemini_api_key")
     if not key:
@@ -140,7 +192,7 @@ def _call_gemini(prompt: str) -> str:
         },
     }
 
-    resp = requests.post(base_url, params=params, json=body, timeout=90)
+    resp = _post(base_url, cancel, params=params, json=body, timeout=90)
     resp.raise_for_status()
     data = resp.json()
     try:
@@ -150,7 +202,7 @@ def _call_gemini(prompt: str) -> str:
 
 # -------------------- GitHub Copilot (stub / customizable) --------------------
 
-def _call_copilot(prompt: str) -> str:
+def _call_copilot(prompt: str, cancel: threading.Event | None = None) -> str:
     """
     This is intentionally a stub.
 
@@ -165,7 +217,7 @@ def _call_copilot(prompt: str) -> str:
 
 # -------------------- Self-hosted OpenAI-compatible backend --------------------
 
-def _call_selfhost(prompt: str) -> str:
+def _call_selfhost(prompt: str, cancel: threading.Event | None = None) -> str:
     """
     Call a self-hosted OpenAI-compatible backend (vLLM, Ollama, LM Studio, etc.).
     """
@@ -212,7 +264,7 @@ def _call_selfhost(prompt: str) -> str:
     }
 
     try:
-        resp = requests.post(endpoint, headers=headers, json=body, timeout=90)
+        resp = _post(endpoint, cancel, headers=headers, json=body, timeout=90)
         if resp.status_code >= 400:
             try:
                 data = resp.json()
@@ -220,6 +272,8 @@ def _call_selfhost(prompt: str) -> str:
             except Exception:
                 msg = resp.text
             raise RemoteAIError(f"Selfhost error {resp.status_code}: {msg}")
+    except RemoteAICancelled:
+        raise
     except HTTPError as exc:
         raise RemoteAIError(f"Selfhost HTTP error: {exc}") from exc
     except Exception as exc:
@@ -233,27 +287,37 @@ def _call_selfhost(prompt: str) -> str:
     
 # -------------------- Public entrypoints --------------------
 
-def analyze_file_remote(provider: ProviderType, path: Path, content: str) -> str:
+def analyze_file_remote(
+    provider: ProviderType,
+    path: Path,
+    content: str,
+    cancel: threading.Event | None = None,
+) -> str:
     prompt = _build_file_prompt(path, content)
     if provider == "gpt":
-        return _call_openai(prompt)
+        return _call_openai(prompt, cancel)
     if provider == "gemini":
-        return _call_gemini(prompt)
+        return _call_gemini(prompt, cancel)
     if provider == "copilot":
-        return _call_copilot(prompt)
+        return _call_copilot(prompt, cancel)
     if provider == "selfhost":
-        return _call_selfhost(prompt)
+        return _call_selfhost(prompt, cancel)
     raise RemoteAIError(f"Unsupported remote provider: {provider}")
 
-def analyze_directory_remote(provider: ProviderType, path: Path, manifest: str) -> str:
+def analyze_directory_remote(
+    provider: ProviderType,
+    path: Path,
+    manifest: str,
+    cancel: threading.Event | None = None,
+) -> str:
     prompt = _build_dir_prompt(path, manifest)
     if provider == "gpt":
-        return _call_openai(prompt)
+        return _call_openai(prompt, cancel)
     if provider == "gemini":
-        return _call_gemini(prompt)
+        return _call_gemini(prompt, cancel)
     if provider == "copilot":
-        return _call_copilot(prompt)
+        return _call_copilot(prompt, cancel)
     if provider == "selfhost":
-        return _call_selfhost(prompt)
+        return _call_selfhost(prompt, cancel)
     raise RemoteAIError(f"Unsupported remote provider: {provider}")
 
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from pathlib import Path
 import json
 import os
-from typing import Optional
+from typing import Optional, Tuple
 
 
 def _default_config_path() -> Path:
@@ -25,22 +25,47 @@ class AppConfig:
     hf_token: Optional[str] = None  # Hugging Face token for gated models
 
 
+# ((mtime_ns, size) of the config file, parsed config); see load_config
+_config_cache: Optional[Tuple[Tuple[int, int], AppConfig]] = None
+
+
 def load_config() -> AppConfig:
-    """Load config from disk, or return a default config if missing/invalid."""
+    """
+    Load config from disk, or return a default config if missing/invalid.
+
+    The parsed file is reused until its mtime/size change (e.g. reopening
+    the Settings screen); callers get their own copy and may modify it.
+    """
+    global _config_cache
+    try:
+        st = CONFIG_PATH.stat()
+    except OSError:
+        return AppConfig()
+
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _config_cache
+    if cached is not None and cached[0] == sig:
+        return replace(cached[1])
+
+    cfg = AppConfig()
     try:
         if CONFIG_PATH.is_file():
             data = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
-            return AppConfig(**data)
+            cfg = AppConfig(**data)
     except Exception:
         # Don't blow up ShellPilot if config is corrupt
         pass
-    return AppConfig()
+    _config_cache = (sig, cfg)
+    return replace(cfg)
 
 
 def save_config(cfg: AppConfig) -> None:
     """Persist config to disk."""
+    global _config_cache
     CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
     CONFIG_PATH.write_text(
         json.dumps(asdict(cfg), indent=2),
         encoding="utf-8",
     )
+    # A rewrite within the same mtime tick could keep the old signature
+    _config_cache = None
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 import shlex
@@ -28,6 +29,32 @@ class ShellCommand:
         return self.command
 
 
+# Preview helpers are rebuilt on every selection; cache them per path
+_PREVIEW_COMMAND_CACHE = 256
+
+_TAIL_EXPLANATION = (
+    "Shows the *end* of the log using `tail -n 80`:\n"
+    "  • Useful for recent errors or activity\n"
+    "  • Does not modify the file in any way\n"
+)
+
+_CSV_EXPLANATION = (
+    "Shows the first rows of the CSV as a simple table:\n"
+    "  • `head -n 40` limits output to 40 lines\n"
+    "  • `column -s, -t` aligns columns on commas\n"
+    "This is read-only and safe to run."
+)
+
+_HEXDUMP_EXPLANATION = (
+    "This command shows the first part of the file in hex + ASCII:\n"
+    "  • Offsets on the left\n"
+    "  • Hex bytes in the middle\n"
+    "  • Printable characters on the right\n\n"
+    "Useful for inspecting binaries, compiled files, and unknown formats."
+)
+
+
+@lru_cache(maxsize=_PREVIEW_COMMAND_CACHE)
 def build_ls_command(path: Path) -> ShellCommand:
     """
     Build a safe 'ls -lha' command for the given path with an explanation
@@ -49,6 +76,7 @@ def build_ls_command(path: Path) -> ShellCommand:
     )
 
 
+@lru_cache(maxsize=_PREVIEW_COMMAND_CACHE)
 def build_view_file_command(path: Path, max_lines: int = 80) -> ShellCommand:
     """
     Build a safe 'view file' command.
@@ -74,6 +102,42 @@ def build_view_file_command(path: Path, max_lines: int = 80) -> ShellCommand:
     )
 
 
+@lru_cache(maxsize=_PREVIEW_COMMAND_CACHE)
+def build_tail_command(path: Path) -> ShellCommand:
+    """Build a read-only 'tail' command for a log file."""
+    return ShellCommand(
+        description=f"Tail of {path.name}",
+        command=f"tail -n 80 -- {shlex.quote(path.name)}",
+        explanation=_TAIL_EXPLANATION,
+        cwd=path.parent,
+        dangerous=False,
+    )
+
+
+@lru_cache(maxsize=_PREVIEW_COMMAND_CACHE)
+def build_csv_preview_command(path: Path) -> ShellCommand:
+    """Build a read-only command that shows the head of a CSV as a table."""
+    return ShellCommand(
+        description=f"Pretty-print CSV {path.name}",
+        command=f"head -n 40 -- {shlex.quote(path.name)} | column -s, -t",
+        explanation=_CSV_EXPLANATION,
+        cwd=path.parent,
+        dangerous=False,
+    )
+
+
+@lru_cache(maxsize=_PREVIEW_COMMAND_CACHE)
+def build_hexdump_command(path: Path) -> ShellCommand:
+    """Build a read-only 'hexdump -C' command for a binary file."""
+    return ShellCommand(
+        description=f"Hex dump of {path.name}",
+        command=f"hexdump -C -- {shlex.quote(path.name)}",
+        explanation=_HEXDUMP_EXPLANATION,
+        cwd=path.parent,
+        dangerous=False,
+    )
+
+
 def build_mv_command(src: Path, dst: Path) -> ShellCommand:
     """
     Move/rename a file or directory.
@@ -1,13 +1,29 @@
 from __future__ import annotations
 from pathlib import Path
 from typing import List
+import os
 
 def list_dir(path: Path) -> List[Path]:
-    """Return sorted directory contents (dirs first, then files)."""
-    entries = list(path.iterdir())
-    dirs = sorted([e for e in entries if e.is_dir()])
-    files = sorted([e for e in entries if e.is_file()])
-    return dirs + files
+    """
+    Return sorted directory contents (dirs first, then files).
+
+    Uses os.scandir so dir/file checks come from the directory entry's
+    d_type instead of a stat() per entry (symlinks are still followed).
+    """
+    dirs: list[str] = []
+    files: list[str] = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir():
+                    dirs.append(entry.name)
+                elif entry.is_file():
+                    files.append(entry.name)
+            except OSError:
+                continue
+    dirs.sort()
+    files.sort()
+    return [path / name for name in dirs] + [path / name for name in files]
 
 def rename_entry(path: Path, new_name: str) -> Path:
     """Rename a file or directory to `new_name` within the same parent."""
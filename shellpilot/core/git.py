@@ -24,6 +24,32 @@ def is_git_repo(path: Path) -> bool:
     return run_git(["rev-parse", "--is-inside-work-tree"], cwd=path) == "true"
 
 
+def find_git_dirs(path: Path) -> tuple[Path, Path] | None:
+    """
+    Locate the enclosing work tree without running git.
+
+    Walks up from path looking for a `.git` entry and returns
+    (worktree_root, git_dir), or None if there isn't one. A `.git` file
+    (worktrees, submodules) is followed via its `gitdir:` line.
+    """
+    for candidate in (path, *path.parents):
+        dot_git = candidate / ".git"
+        if dot_git.is_dir():
+            return candidate, dot_git
+        if dot_git.is_file():
+            try:
+                line = dot_git.read_text().strip()
+            except OSError:
+                return None
+            if line.startswith("gitdir:"):
+                git_dir = Path(line[len("gitdir:"):].strip())
+                if not git_dir.is_absolute():
+                    git_dir = candidate / git_dir
+                return candidate, git_dir
+            return None
+    return None
+
+
 def get_git_root(path: Path) -> Path | None:
     out = run_git(["rev-parse", "--show-toplevel"], cwd=path)
     return Path(out) if out else None
@@ -39,7 +65,9 @@ def get_git_status(path: Path) -> dict:
     Return a dictionary summarizing the repo’s status.
     Good for the status bar or quick-view overlays.
     """
-    porcelain = run_git(["status", "--porcelain"], cwd=path)
+    # No index refresh: rewriting .git/index would wake the Git watcher,
+    # which would probe (and rewrite) again
+    porcelain = run_git(["--no-optional-locks", "status", "--porcelain"], cwd=path)
     branch = get_git_branch(path)
 
     added = modified = deleted = untracked = 0
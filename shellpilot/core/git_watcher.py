@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+# Optional: event-driven Git refresh (pip install shellpilot[watch])
+try:
+    from watchdog.events import FileSystemEvent, FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEvent = FileSystemEventHandler = Observer = None
+
+try:
+    import pathspec
+except ImportError:
+    pathspec = None
+
+
+def _load_gitignore(root: Path):
+    """Return a PathSpec for root/.gitignore, or None if unavailable."""
+    if pathspec is None:
+        return None
+    try:
+        lines = (root / ".gitignore").read_text().splitlines()
+    except OSError:
+        return None
+    return pathspec.PathSpec.from_lines("gitwildmatch", lines)
+
+
+if FileSystemEventHandler is not None:
+
+    class _RepoEventHandler(FileSystemEventHandler):
+        """Forward relevant changes under a work tree to a callback."""
+
+        def __init__(self, root: Path, on_change: Callable[[], None]) -> None:
+            super().__init__()
+            self.root = root
+            self.on_change = on_change
+            self.ignore = _load_gitignore(root)
+
+        def _is_noise(self, src: str) -> bool:
+            try:
+                rel = Path(src).relative_to(self.root).as_posix()
+            except ValueError:
+                return True
+
+            if rel.startswith(".git/"):
+                # git's own churn: lock files and the object store
+                return rel == ".git/index.lock" or rel.startswith(".git/objects/")
+            if self.ignore is not None and self.ignore.match_file(rel):
+                return True
+            return False
+
+        def on_any_event(self, event: FileSystemEvent) -> None:
+            if event.event_type in ("opened", "closed_no_write"):
+                return
+            # A directory "modified" always accompanies an event for the child
+            if event.is_directory and event.event_type == "modified":
+                return
+            if self._is_noise(str(event.src_path)):
+                # git installs a new index/ref by renaming its .lock file
+                # into place, so a move only counts by where it lands
+                dest = getattr(event, "dest_path", "")
+                if not dest or self._is_noise(str(dest)):
+                    return
+            self.on_change()
+
+
+class GitWatcher:
+    """
+    Watch one Git work tree and call on_change when something in it changes.
+
+    Uses watchdog (inotify / FSEvents) when it is installed; otherwise this
+    is a no-op and callers keep relying on navigation-driven refreshes.
+    watch() and stop() may be called from any thread.
+    """
+
+    def __init__(self, on_change: Callable[[], None]) -> None:
+        self.on_change = on_change
+        self.root: Optional[Path] = None
+        self._observer = None
+        self._stopped = False
+        # Probes for different paths can finish on different pool threads
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return Observer is not None
+
+    def watch(self, root: Optional[Path]) -> None:
+        """Switch to watching root (None stops watching)."""
+        if root == self.root or not self.available:
+            return
+        with self._lock:
+            if root != self.root and not self._stopped:
+                self._switch(root)
+
+    def _switch(self, root: Optional[Path]) -> None:
+        if self._observer is None:
+            self._observer = Observer()
+            self._observer.daemon = True
+            self._observer.start()
+        else:
+            self._observer.unschedule_all()
+
+        self.root = root
+        if root is not None:
+            try:
+                self._observer.schedule(
+                    _RepoEventHandler(root, self.on_change), str(root), recursive=True
+                )
+            except OSError:
+                # e.g. inotify watch limit reached: fall back to no watching
+                self.root = None
+
+    def stop(self) -> None:
+        """Stop the observer thread."""
+        with self._lock:
+            self._stopped = True
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer = None
+            self.root = None
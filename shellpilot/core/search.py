@@ -2,11 +2,18 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum, auto
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, TypeVar, Sequence, Callable, List
 import difflib
 import re
 
+# Optional: batched C++ fuzzy scoring (pip install rapidfuzz)
+try:
+    from rapidfuzz import fuzz as _rf_fuzz, process as _rf_process
+except ImportError:
+    _rf_fuzz = _rf_process = None
+
 T = TypeVar("T")
 
 class SearchMode(Enum):
@@ -65,6 +72,89 @@ def fuzzy_score(query: str, text: str, *, case_sensitive: bool = False) -> float
 
     return difflib.SequenceMatcher(None, q, t).ratio()
 
+
+def fuzzy_scores(
+    query: str, texts: Sequence[str], *, case_sensitive: bool = False
+) -> List[float]:
+    """
+    Score every entry of `texts` against `query` in one batch.
+
+    Same scale and heuristics as fuzzy_score(). With rapidfuzz installed the
+    similarity pass runs as a single extract() call in C++ instead of one
+    difflib matcher per entry.
+    """
+    q = _normalize(query, case_sensitive=case_sensitive)
+    if not q:
+        return [1.0] * len(texts)
+
+    if _rf_process is None:
+        return [fuzzy_score(query, t, case_sensitive=case_sensitive) for t in texts]
+
+    norm = [_normalize(t, case_sensitive=case_sensitive) for t in texts]
+    if not norm:
+        return []
+    ratios = [0.0] * len(norm)
+    for _, r, idx in _rf_process.extract(q, norm, scorer=_rf_fuzz.ratio, limit=None):
+        ratios[idx] = r
+
+    scores: List[float] = []
+    for t, r in zip(norm, ratios):
+        if q == t:
+            scores.append(1.0)
+        elif q in t:
+            scores.append(0.7 + 0.25 * len(q) / max(len(t), len(q)))
+        else:
+            scores.append(float(r) / 100.0)
+    return scores
+
+@lru_cache(maxsize=65536)
+def _char_mask(text: str) -> int:
+    """64-bit Bloom-style mask of the characters in text."""
+    mask = 0
+    for ch in set(text):
+        mask |= 1 << (ord(ch) & 63)
+    return mask
+
+
+def fuzzy_candidates(
+    query: str,
+    texts: Sequence[str],
+    *,
+    case_sensitive: bool = False,
+    min_score: float = 0.55,
+) -> List[int]:
+    """
+    Return indices of `texts` that could score >= min_score for `query`.
+
+    Cheap rejection before fuzzy_scores(): a text containing every query
+    character is always kept (it may be a substring match); otherwise the
+    similarity ratio is at most 2 * shared / (len(q) + len(t)), where
+    `shared` counts query characters whose mask bit is set in the text.
+    Mask collisions only over-count, so nothing that could match is dropped.
+    """
+    q = _normalize(query, case_sensitive=case_sensitive)
+    if not q:
+        return list(range(len(texts)))
+
+    bit_counts: dict[int, int] = {}
+    for ch in q:
+        bit = 1 << (ord(ch) & 63)
+        bit_counts[bit] = bit_counts.get(bit, 0) + 1
+    qmask = sum(bit_counts)
+    lq = len(q)
+
+    keep: List[int] = []
+    for i, text in enumerate(texts):
+        t = _normalize(text, case_sensitive=case_sensitive)
+        mask = _char_mask(t)
+        if mask & qmask == qmask:
+            keep.append(i)
+            continue
+        shared = sum(n for bit, n in bit_counts.items() if mask & bit)
+        if 2 * shared >= min_score * (lq + len(t)):
+            keep.append(i)
+    return keep
+
 @dataclass
 class SearchResult(List[T]):
     item: T
@@ -89,11 +179,14 @@ def fuzzy_filter(
         # Treat everything as a neutral "match" when query is empty
         return [SearchResult(item=i, score=1.0) for i in items]
 
-    results: List[SearchResult] = []
-    for item in items:
-        s = fuzzy_score(q, key(item), case_sensitive=case_sensitive)
-        if s >= min_score:
-            results.append(SearchResult(item=item, score=s))
+    texts = [key(item) for item in items]
+    idx = fuzzy_candidates(q, texts, case_sensitive=case_sensitive, min_score=min_score)
+    scores = fuzzy_scores(q, [texts[i] for i in idx], case_sensitive=case_sensitive)
+    results: List[SearchResult] = [
+        SearchResult(item=items[i], score=s)
+        for i, s in zip(idx, scores)
+        if s >= min_score
+    ]
 
     results.sort(key=lambda r: r.score, reverse=True)
 
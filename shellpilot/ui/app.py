@@ -1,39 +1,53 @@
 from __future__ import annotations
 from pathlib import Path
 import os
+import errno
+import bisect
+import heapq
+import queue
 import stat as statmod
 import subprocess
 import json
+import shlex
 import shutil
+import signal
 import uuid
 import sys
 import threading
 import time
-import requests
-from typing import Any, Optional
-from datetime import datetime
+from typing import Any, Iterator, Optional
+from dataclasses import dataclass
+from operator import attrgetter
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
+from urllib.parse import urlparse
 
-from rich.syntax import Syntax
 from rich.console import Group, RenderableType
 from rich.text import Text
 from rich.panel import Panel
-from rich.markdown import Markdown
-from rich.text import Text
 
+# Optional: faster session/trash index JSON (pip install shellpilot[json])
 try:
-    from PIL import Image as PILImage
+    import orjson
 except ImportError:
-    PILImage = None
+    orjson = None
 
-from textual.app import App, ComposeResult
+from textual.app import App, ComposeResult, SuspendNotSupported
 from textual.binding import Binding
 from textual.widgets import Static, Input, ListView
 from textual.containers import Horizontal, Vertical, VerticalScroll
 from textual.screen import ModalScreen
+from textual.timer import Timer
+from textual.message import Message
 
+from shellpilot.core import fs_browser
 from shellpilot.core.fs_browser import list_dir  # still used in action menu
 from shellpilot.core.commands import (
+    build_csv_preview_command,
+    build_hexdump_command,
     build_ls_command,
+    build_tail_command,
     build_view_file_command,
     ShellCommand,
 )
@@ -42,19 +56,19 @@ from shellpilot.ui.action_menu import ActionMenu
 from shellpilot.utils.ls_colors import style_for_path
 from shellpilot.utils.log_highlighter import LogHighlighter
 from shellpilot.core.search import SearchQuery, SearchMode, FileTypeFilter, fuzzy_score
-from shellpilot.ai.engine import get_engine, set_engine_model
-from shellpilot.ai.models import get_model_registry, get_model_path
 from shellpilot.ui.settings import SettingsScreen
 from shellpilot.config import load_config, save_config, AppConfig
-from shellpilot.core.git import is_git_repo, get_git_status
+from shellpilot.core.git import is_git_repo, get_git_status, find_git_dirs
+from shellpilot.core.git_watcher import GitWatcher
 from shellpilot.ai.hardware import detect_nvidia_gpu
 from shellpilot.ui.widgets import FileList, CommandPreview, OutputPanel
 from shellpilot.utils.preview import (
     is_log_file,
-    read_log_text,
+    read_log_tail,
     is_binary_file,
     hex_dump,
     language_for_path,
+    looks_binary,
     pillow_rich_image,
 )
 from shellpilot.ai.config import (
@@ -63,18 +77,234 @@ from shellpilot.ai.config import (
     set_provider_and_key,
     get_effective_ai_settings,
 )
-from shellpilot.ai.remote import (
-    analyze_file_remote,
-    analyze_directory_remote,
-    RemoteAIError,
+from shellpilot.ai.models import (
+    get_model_registry,
+    get_model_path,
+    get_installed_model_ids,
 )
 
-log_highlighter = LogHighlighter()
+# Git probes are debounced while navigating: normal delay, delay during a
+# burst (> _GIT_BURST_EVENTS moves within _GIT_BURST_WINDOW), and the longest
+# any navigation may wait for a probe
+_GIT_DEBOUNCE_SECS = 0.15
+_GIT_BURST_DEBOUNCE_SECS = 0.75
+_GIT_DEBOUNCE_MAX_SECS = 1.0
+_GIT_BURST_WINDOW = 0.5
+_GIT_BURST_EVENTS = 3
+# Cached Git status is reused while .git/index and the root are unchanged,
+# but never for longer than this
+_GIT_CACHE_TTL_SECS = 30.0
+
+# Previews requested in quick succession (key repeat) are coalesced: the
+# first one after a pause runs at once, later ones wait for this much quiet
+_PREVIEW_DEBOUNCE_SECS = 0.12
+
+# Max number of highlighted code previews kept in the LRU cache
+_PREVIEW_CACHE_MAX = 64
+
+# The AI prompt only ever uses this many characters of a file's contents
+_AI_MAX_CHARS = 16_000
+# Leading bytes sniffed to refuse explaining binary files
+_BINARY_SNIFF_BYTES = 2048
+# Model download progress repaints at most this often (plus every 0.5%)
+_DOWNLOAD_PROGRESS_SECS = 0.1
+
+# Explaining a directory stats at most this many entries for its summary
+_AI_SCAN_MAX_STATS = 500
+# Streaming AI output: repaint after this many chunks or seconds, whichever first
+_AI_STREAM_FLUSH_CHUNKS = 16
+_AI_STREAM_FLUSH_SECS = 0.25
+
+# Files above this size are previewed as plain text (head only), no lexer
+_MAX_HIGHLIGHT_BYTES = 256 * 1024
+try:
+    _MAX_HIGHLIGHT_BYTES = int(
+        os.getenv("SHELLPILOT_MAX_HIGHLIGHT_BYTES", _MAX_HIGHLIGHT_BYTES)
+    )
+except ValueError:
+    # A malformed override keeps the default instead of breaking startup
+    pass
+
+# Highlighted files above this size paint their first chunk immediately and
+# have the full view built in a background thread
+_PREVIEW_HEAD_BYTES = 64 * 1024
+_PREVIEW_CHUNK_LINES = 500
+
+# Size of the shared pool behind call_in_thread
+_WORKER_THREADS = 4
+# Trash entries deleted at once when emptying the trash (I/O-bound, so a
+# few more than the core count still helps on slow or networked disks)
+_TRASH_DELETE_WORKERS = min(8, 2 * (os.cpu_count() or 4))
+
+# Footer repaints are coalesced to at most one per frame (~30 Hz)
+_STATUS_FLUSH_SECS = 1 / 30
+
+# Binary previews hex-dump at most this many leading bytes
+_HEX_PREVIEW_BYTES = 4096
+
+# Log previews show the last lines from at most this many trailing bytes
+_LOG_PREVIEW_BYTES = 256 * 1024
+
+# Text of the F1 key help dialog; built once instead of on every open
+_KEY_HELP_TEXT = (
+    "[b]Navigation[/b]\n"
+    "  h              Home (~)\n"
+    "  t              Open trash view\n"
+    "  Left/Right     Up directory / enter / preview\n"
+    "  PageUp/Down    Scroll file list\n"
+    "\n"
+    "[b]Files & Trash[/b]\n"
+    "  Enter          Run last command / refresh preview\n"
+    "  e              Open in editor\n"
+    "  Delete         Move to ShellPilot trash\n"
+    "  r              Restore selected (in trash view)\n"
+    "  E              Empty trash (in trash view)\n"
+    "\n"
+    "[b]Search & Bookmarks[/b]\n"
+    "  /              Focus filter input\n"
+    "  Ctrl+B         Bookmark current directory\n"
+    "  Ctrl+J         Jump to next bookmark\n"
+    "\n"
+    "[b]SENTRA & Command Palette[/b]\n"
+    "  a              Ask SENTRA about the selected file/dir\n"
+    "  : / Ctrl+P     Command palette\n"
+    "\n"
+    "[b]App & UI[/b]\n"
+    "  Ctrl+,         Settings\n"
+    "  ?              Toggle side help panel\n"
+    "  q              Quit ShellPilot\n"
+    "  F1             Show this key help dialog\n"
+)
+
+def _read_text_fast(path: Path, limit: int = -1, errors: str = "replace") -> str:
+    """
+    Read *path* as UTF-8 in a single unbuffered read.
+
+    Decoding errors are handled by *errors* instead of a second read, and
+    *limit* caps how many bytes are read (-1 = whole file).
+    """
+    with path.open("rb", buffering=0) as f:
+        data = f.readall() if limit < 0 else f.read(limit)
+    return data.decode("utf-8", errors=errors)
+
+def _dump_json(data: Any) -> bytes:
+    """Serialize data as indented JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+def _load_json(path: Path) -> Any:
+    """Parse a JSON file straight from bytes (orjson when available)."""
+    raw = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _move_path(src: Path, dst: Path) -> None:
+    """
+    Move *src* to *dst*, preferring a single atomic rename(2).
+
+    os.replace behaves the same on every platform (no Windows-only
+    FileExistsError). Falls back to shutil.move (copy + delete) only when
+    the two paths live on different filesystems.
+
+    Never overwrites: the destination is re-checked right before the move,
+    since it may have appeared after the caller picked the name.
+    """
+    if os.path.lexists(dst):
+        raise FileExistsError(errno.EEXIST, "Destination already exists", str(dst))
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(str(src), str(dst))
+
+# rich.markdown (and markdown-it) is only needed once SENTRA answers
+_Markdown: Any = None
+
+def _markdown(text: str) -> RenderableType:
+    """Build a rich Markdown renderable, importing rich.markdown on first use."""
+    global _Markdown
+    if _Markdown is None:
+        from rich.markdown import Markdown as _Markdown
+    return _Markdown(text)
+
+def _item_is_dir(item: Any, path: Path) -> bool:
+    """Use the FileList row's cached entry type; stat only if it has none."""
+    flag = getattr(item, "is_dir", None)
+    return path.is_dir() if flag is None else flag
+
+# Sort key for os.DirEntry objects
+_entry_name = attrgetter("name")
+
+def _now_iso() -> str:
+    """Local time as 'YYYY-MM-DDTHH:MM:SS' (same as isoformat(timespec='seconds'))."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime())
+
+def _file_signature(path: Path) -> Optional[tuple[int, int]]:
+    """Return *path*'s (mtime_ns, size), or None if it can't be stat'ed."""
+    try:
+        st = path.stat()
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+def _remove_entry(entry: os.DirEntry) -> None:
+    """Delete a scandir entry: a file, symlink, or whole directory tree."""
+    # d_type from the directory listing: no stat() per entry
+    if entry.is_dir(follow_symlinks=False):
+        shutil.rmtree(entry.path)
+    else:
+        os.unlink(entry.path)
+
+def _spawn_detached(argv: list[str]) -> None:
+    """
+    Launch *argv* (a desktop opener such as xdg-open) without waiting for
+    it and without sharing our terminal.
+
+    On POSIX this uses posix_spawnp, which avoids fork()'s page-table copy
+    of a large parent process (e.g. once a local model is loaded).
+    Falls back to subprocess.Popen elsewhere or if the spawn fails.
+    """
+    if hasattr(os, "posix_spawnp"):
+        devnull = os.devnull
+        file_actions = [
+            (os.POSIX_SPAWN_OPEN, 0, devnull, os.O_RDONLY, 0),
+            (os.POSIX_SPAWN_OPEN, 1, devnull, os.O_WRONLY, 0),
+            (os.POSIX_SPAWN_OPEN, 2, devnull, os.O_WRONLY, 0),
+        ]
+        try:
+            pid = os.posix_spawnp(
+                argv[0],
+                argv,
+                os.environ,
+                file_actions=file_actions,
+                setsid=True,
+                setsigdef=(signal.SIGINT, signal.SIGTERM),
+            )
+        except OSError:
+            pass
+        else:
+            # Reap the child when it exits so it doesn't linger as a zombie
+            threading.Thread(target=os.waitpid, args=(pid, 0), daemon=True).start()
+            return
+
+    subprocess.Popen(
+        argv,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
 
+@lru_cache(maxsize=1)
 def _has_passwordless_sudo() -> bool:
     """
     Return True if the current user appears to have passwordless sudo.
 
+    Memoized: sudoers doesn't change mid-session, so we fork sudo only once.
+
     We use `sudo -n true`:
       - exit 0 → sudo allowed without password
       - exit != 0 → either not in sudoers or password required
@@ -102,6 +332,14 @@ class ShellPilotFooter(Static):
         # message can be a str or a Rich Text / Panel / etc.
         self.update(message or "")
 
+@dataclass(frozen=True)
+class _UIRefs:
+    """Widget handles resolved once on mount; every field is non-None."""
+    output: OutputPanel
+    preview: CommandPreview
+    status: ShellPilotFooter
+    breadcrumb: Static
+
 class KeyHelpScreen(ModalScreen[None]):
     """Modal popup showing all key bindings (replaces footer key bar)."""
 
@@ -114,8 +352,6 @@ class KeyHelpScreen(ModalScreen[None]):
         self.help_text = help_text
 
     def compose(self) -> ComposeResult:
-        from textual.containers import Vertical
-
         yield Vertical(
             Static("[b]ShellPilot key bindings[/b]", id="keyhelp-title"),
             Static(
@@ -135,6 +371,35 @@ class ShellPilotApp(App):
     CSS_PATH = "app.tcss"
     auto_footer = False
 
+    # Step labels for the AI progress panel (step 2 varies by provider)
+    _AI_STAGE_LABELS = (
+        "Read and summarize contents",
+        "Analyze with local AI model",
+        "Organize explanation for display",
+    )
+    _AI_STEP2_LABELS = {
+        "local": "Analyze with local AI model",
+        "gpt": "Analyze with OpenAI GPT",
+        "gemini": "Analyze with Google Gemini",
+        "copilot": "Analyze with GitHub Copilot",
+        "selfhost": "Analyze with self-hosted backend",
+    }
+    # Display names for remote AI providers
+    _AI_PROVIDER_LABELS = {
+        "gpt": "OpenAI GPT",
+        "gemini": "Google Gemini",
+        "copilot": "GitHub Copilot",
+        "selfhost": "self-hosted backend",
+    }
+    # Local CPU thread-count tiers: _AI_THREAD_TIERS[bisect(bounds, n)]
+    _AI_THREAD_TIER_BOUNDS = (4, 8, 12)
+    _AI_THREAD_TIERS = (
+        "🐢 Using {n} CPU thread (local, limited mode)",
+        "⚙️  Using {n} CPU threads (local)",
+        "🚀 Using {n} CPU threads (local)",
+        "🔥 Using {n} CPU threads (high performance, local)",
+    )
+
     BINDINGS = [
         ("q", "quit", "Quit"),
         ("enter", "run_command", "Run command"),
@@ -157,6 +422,7 @@ class ShellPilotApp(App):
         ("pageup", "page_up", "Page up"),
         ("pagedown", "page_down", "Page down"),
         Binding("f1", "open_key_help", "Key help"),
+        Binding("escape", "ai_cancel", "Cancel AI", show=False),
     ]
 
     def __init__(self, start_path: Optional[Path] = None, **kwargs):
@@ -169,24 +435,44 @@ class ShellPilotApp(App):
 
         # Initialize trash before App startup
         self.trash_dir, self.trash_index_path = self._init_trash_dir()
+        # trash_dir never moves while we run: resolve it once
+        self._trash_dir_resolved = self.trash_dir.resolve()
+        self._trash_dir_prefix = str(self._trash_dir_resolved) + os.sep
+        # (current dir, its resolved form); see _current_dir_resolved
+        self._resolved_dir: Optional[tuple[Path, Path]] = None
         self.trash_index: dict[str, dict] = self._load_trash_index()
+        # Trash index and session writes are debounced; see _schedule_*_save()
+        self._session_dirty = False
+        self._session_flush_handle: Optional[Timer] = None
+        self._trash_index_dirty = False
+        self._trash_flush_handle: Optional[Timer] = None
+        # Serializes state-file writes from background threads
+        self._persist_lock = threading.Lock()
+        self._persist_seq = 0
+        self._persist_written: dict[Path, int] = {}
+        # Newest (seq, payload) per path still queued for a background write
+        self._persist_pending: dict[Path, tuple[int, bytes]] = {}
 
         # AI hardware status (set once a local engine is used)
         # Tuple: ("cpu" | "gpu", optional_gpu_name)
         self._ai_hardware: Optional[tuple[str, Optional[str]]] = None
-
-        # Initialize AI hardware indicator from system GPU detection
-        try:
-            gpu_info = detect_nvidia_gpu()
-        except Exception:
-            gpu_info = None
-
-        if gpu_info is not None:
-            # We have an NVIDIA GPU available in the system
-            self._ai_hardware = ("gpu", gpu_info.name)
-        else:
-            # No GPU visible → assume CPU-only
-            self._ai_hardware = ("cpu", None)
+        # (path, provider, kind, thread status, stage labels) of the AI task
+        # in progress; see _ai_task_context
+        self._ai_progress_ctx: Optional[tuple[Path, str, str, str, tuple[str, str, str]]] = None
+        # (text, Markdown) most recently built for an AI answer; see _ai_markdown
+        self._ai_markdown_last: Optional[tuple[str, RenderableType]] = None
+        # (body, panel) of the last progress panel shown; see _show_ai_progress
+        self._ai_progress_shown: Optional[tuple[str, Panel]] = None
+        # Local AI engine, fetched once and shared by all AI workers
+        self._ai_engine: Any | None = None
+        self._ai_engine_lock = threading.Lock()
+        # Cancel flag for the in-flight streamed AI answer (replaced per request)
+        self._ai_cancel = threading.Event()
+        # Job queue of the single AI worker thread; see call_in_ai_thread
+        self._ai_jobs: Optional[queue.SimpleQueue] = None
+
+        # Assume CPU-only until GPU detection (nvidia-smi) finishes after mount
+        self._ai_hardware = ("cpu", None)
 
         super().__init__(**kwargs)
         
@@ -198,12 +484,49 @@ class ShellPilotApp(App):
         self.search_input: Optional[Input] = None
         self.footer: Optional[ShellPilotFooter] = None
         self.preview_container: Optional[VerticalScroll] = None
+        self.left_pane: Optional[Vertical] = None
+        self.output_container: Optional[VerticalScroll] = None
+
+        # Hot-path widget handles, filled in once on mount
+        self.ui: Optional[_UIRefs] = None
 
         self._last_command: Optional[ShellCommand] = None
 
         # For syntax-highlighted code preview
         self._last_file_path: Optional[Path] = None
         self._last_file_language: Optional[str] = None
+        # (mtime_ns, size) of the previewed code file when it was rendered
+        self._last_file_sig: Optional[tuple[int, int]] = None
+
+        # (index, item widget, path) for the current file-list selection
+        self._selected_path_cache: Optional[tuple[int, Any, Path]] = None
+
+        # LRU of built code previews keyed by (path, mtime_ns, size, lang)
+        self._preview_cache: OrderedDict[tuple, RenderableType] = OrderedDict()
+        # Cache key -> _preview_seq of the latest request for a full preview
+        # that is still being built
+        self._preview_pending: dict[tuple, int] = {}
+        # Bumped on every _preview_file and whenever another view takes over
+        # the output pane (_invalidate_preview); background results from an
+        # older request are dropped instead of flashing over the current one
+        self._preview_seq = 0
+        # Debounced preview requests; see _schedule_preview()
+        self._pending_preview: Optional[Path] = None
+        self._preview_timer: Optional[Timer] = None
+        # (path, (mtime_ns, size), output content, command, status) of the
+        # preview currently on screen; see _remember_preview()
+        self._shown_preview: Optional[tuple[Path, Any, Any, Any, str]] = None
+
+        # Shared pool for short background jobs; see call_in_thread
+        self._executor = ThreadPoolExecutor(
+            max_workers=_WORKER_THREADS, thread_name_prefix="sp-worker"
+        )
+
+        # Pending coalesced footer repaint; see _update_status_with_git
+        self._status_flush_handle: Optional[Timer] = None
+
+        # Built on first log preview (compiles the highlighter's hostname regex)
+        self._log_highlighter: Optional[LogHighlighter] = None
 
         # Bookmarks: paths + current index
         self.bookmarks: list[Path] = saved_bookmarks
@@ -215,12 +538,23 @@ class ShellPilotApp(App):
         self._base_status: str = ""
         self.in_git_repo: bool = False
         self.git_status: Optional[dict[str, Any]] = None
+        # (branch, added, modified, deleted, untracked) -> footer summary
+        self._git_summary_cache: Optional[tuple[tuple, str]] = None
+        # Debounced Git probing (see _refresh_git_state)
+        self._git_refresh_timer: Optional[Timer] = None
+        self._git_pending_since: Optional[float] = None
+        self._git_nav_times: deque[float] = deque(maxlen=8)
+        self._last_git_path: Optional[Path] = None
+        # Event-driven refresh for the current work tree (needs watchdog)
+        self._git_watcher = GitWatcher(lambda: self.post_message(self.GitChanged()))
+        # worktree root -> (index mtime, root mtime, stored at, status)
+        self._git_cache: dict[Path, tuple[float, float, float, dict[str, Any]]] = {}
 
     # ---------- Session helpers ----------
     def _load_session(self) -> tuple[Optional[str], list[Path], bool]:
         """Load last directory, bookmarks, and help visibility from disk, if present."""
         try:
-            data = json.loads(self._session_path.read_text())
+            data = _load_json(self._session_path)
             last_dir = data.get("last_dir")
             bookmarks = [Path(p) for p in data.get("bookmarks", [])]
             help_visible = bool(data.get("help_visible", True))
@@ -232,32 +566,126 @@ class ShellPilotApp(App):
             # Corrupt / unreadable session; ignore and use safe defaults.
             return None, [], True
 
-    def _save_session(self) -> None:
+    def _save_session(self, background: bool = True) -> None:
         """Persist last directory, bookmarks, and help visibility."""
-        try:
-            self._session_path.parent.mkdir(parents=True, exist_ok=True)
-            data = {
-                "last_dir": str(self._current_dir()),
-                "bookmarks": [str(p) for p in self.bookmarks],
-                "help_visible": self._help_visible,
-            }
-            self._session_path.write_text(json.dumps(data, indent=2))
-        except Exception:
-            # Don't crash the app if saving session fails.
-            pass
+        data = {
+            "last_dir": str(self._current_dir()),
+            "bookmarks": [str(p) for p in self.bookmarks],
+            "help_visible": self._help_visible,
+        }
+        self._persist(self._session_path, _dump_json(data), background)
+
+    def _persist(self, path: Path, payload: bytes, background: bool = True) -> None:
+        """
+        Atomically write payload to path, by default off the UI thread.
+
+        Writes are sequenced per path, so a slow older write can never land
+        on top of a newer one.
+        """
+        self._persist_seq += 1
+        seq = self._persist_seq
+        if background:
+            with self._persist_lock:
+                self._persist_pending[path] = (seq, payload)
+            self.call_in_thread(self._persist_worker, path, payload, seq)
+        else:
+            self._persist_worker(path, payload, seq)
+
+    def _persist_worker(self, path: Path, payload: bytes, seq: int) -> None:
+        """Write payload via a temp file + os.replace (crash-safe)."""
+        with self._persist_lock:
+            if seq < self._persist_written.get(path, 0):
+                return
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(path.name + ".tmp")
+                tmp_path.write_bytes(payload)
+                os.replace(tmp_path, path)
+            except Exception:
+                # Don't crash the app if saving state fails.
+                return
+            self._persist_written[path] = seq
+            pending = self._persist_pending.get(path)
+            if pending is not None and pending[0] <= seq:
+                del self._persist_pending[path]
+
+    def _drain_persist(self) -> None:
+        """
+        Synchronously write state that is still queued for a background write.
+
+        Shutdown cancels queued pool jobs, so without this a trash index or
+        session flushed just before quitting could be lost.
+        """
+        with self._persist_lock:
+            pending = list(self._persist_pending.items())
+        for path, (seq, payload) in pending:
+            self._persist_worker(path, payload, seq)
+
+    def _schedule_session_save(self) -> None:
+        """Mark the session dirty and write it at most once per 500 ms."""
+        self._session_dirty = True
+        if self._session_flush_handle is None:
+            self._session_flush_handle = self.set_timer(0.5, self._flush_session)
+
+    def _flush_session(self, background: bool = True) -> None:
+        """Write the session if it has pending changes."""
+        if self._session_flush_handle is not None:
+            self._session_flush_handle.stop()
+            self._session_flush_handle = None
+        if not self._session_dirty:
+            return
+        self._session_dirty = False
+        self._save_session(background)
 
     # ---------- Thread helper for background work ----------
     def call_in_thread(self, func, *args, **kwargs) -> None:
-        """Tiny compatibility shim: run *func* in a background thread.
-
-        Newer Textual versions have App.call_in_thread; older ones don’t.
-        This shim keeps our AI worker code working everywhere.
+        """Run *func* on the shared background worker pool.
+
+        Previews, Git probes, trash moves and state writes are short and
+        frequent: reusing pool threads avoids a thread start per call and
+        caps how many run at once while keys are held down. Jobs that can
+        run for minutes use call_in_ai_thread (AI calls) or
+        call_in_daemon_thread (model downloads) so they never hold up the
+        pool or shutdown.
         """
-        import threading
+        try:
+            self._executor.submit(func, *args, **kwargs)
+        except RuntimeError:
+            # Pool already shut down (a timer fired during unmount): drop it
+            pass
 
+    def call_in_daemon_thread(self, func, *args, **kwargs) -> None:
+        """Run a long-lived *func* in its own daemon thread."""
         thread = threading.Thread(target=func, args=args, kwargs=kwargs, daemon=True)
         thread.start()
 
+    def call_in_ai_thread(self, func, *args) -> None:
+        """Queue *func* for the AI worker: one daemon thread, jobs in order.
+
+        Explain jobs share one local engine that must not run two inferences
+        at once, and their answers must land in the order they were asked
+        for. A superseded streaming job stops at its next token (_ai_cancel),
+        so the queue drains quickly when the user moves on; jobs superseded
+        before they started are dropped without running at all.
+        """
+        jobs = self._ai_jobs
+        if jobs is None:
+            jobs = self._ai_jobs = queue.SimpleQueue()
+            self.call_in_daemon_thread(self._ai_worker_loop, jobs)
+        jobs.put((func, args, self._ai_cancel))
+
+    @staticmethod
+    def _ai_worker_loop(jobs: queue.SimpleQueue) -> None:
+        while True:
+            func, args, cancel = jobs.get()
+            if cancel.is_set():
+                continue
+            try:
+                func(*args)
+            except Exception:
+                # Workers report their own errors; keep serving the queue
+                pass
+
     # --- Utility: bridge helpers used by the action menu ---
     def get_current_entry_path(self) -> Path | None:
         """Return the currently highlighted entry (file/dir) as a Path."""
@@ -269,7 +697,9 @@ class ShellPilotApp(App):
 
     def refresh_browser(self) -> None:
         """Refresh directory listing after FS change."""
-        if self.file_list:
+        self._invalidate_git_cache()
+        if self.file_list is not None:
+            self.file_list.invalidate_listing()
             self.file_list.refresh_entries()
         self._update_breadcrumb()
 
@@ -284,16 +714,29 @@ class ShellPilotApp(App):
             return ""
 
         gs = self.git_status
-        branch = gs.get("branch") or "?"
+        key = (
+            gs.get("branch") or "?",
+            gs.get("added", 0),
+            gs.get("modified", 0),
+            gs.get("deleted", 0),
+            gs.get("untracked", 0),
+        )
+        cached = self._git_summary_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        branch, added, modified, deleted, untracked = key
 
         # You can tweak this string however you like
-        return (
+        summary = (
             f" {branch}  "
-            f"+{gs.get('added', 0)} "
-            f"~{gs.get('modified', 0)} "
-            f"-{gs.get('deleted', 0)} "
-            f"?{gs.get('untracked', 0)}"
+            f"+{added} "
+            f"~{modified} "
+            f"-{deleted} "
+            f"?{untracked}"
         )
+        self._git_summary_cache = (key, summary)
+        return summary
     
     def _set_ai_hardware_from_engine(self, engine: Any) -> None:
         """Update cached AI hardware mode (CPU/GPU) from the AI engine."""
@@ -309,6 +752,27 @@ class ShellPilotApp(App):
         # Re-render status bar with new hardware info
         self._update_status_with_git()
 
+    def _detect_gpu_worker(self) -> None:
+        """Background worker: detect an NVIDIA GPU for the AI indicator."""
+        try:
+            gpu_info = detect_nvidia_gpu()
+        except Exception:
+            gpu_info = None
+        self.call_from_thread(self._apply_detected_gpu, gpu_info)
+
+    def _apply_detected_gpu(self, gpu_info: Any) -> None:
+        """Update the AI indicator from system GPU detection."""
+        if self._ai_engine is not None:
+            # A loaded engine already reported its actual mode
+            return
+        if gpu_info is not None:
+            # We have an NVIDIA GPU available in the system
+            self._ai_hardware = ("gpu", gpu_info.name)
+        else:
+            # No GPU visible → assume CPU-only
+            self._ai_hardware = ("cpu", None)
+        self._update_status_with_git()
+
     def _format_ai_hardware_status(self) -> str:
         """Return a tiny AI status segment for the footer.
 
@@ -357,7 +821,6 @@ class ShellPilotApp(App):
             host = ""
             if base_url:
                 try:
-                    from urllib.parse import urlparse
                     host = urlparse(base_url).hostname or ""
                 except Exception:
                     host = ""
@@ -367,8 +830,24 @@ class ShellPilotApp(App):
         return f"🌐 SENTRA · {provider}"
 
     def _update_status_with_git(self) -> None:
+        """
+        Schedule a footer repaint.
+
+        Status, Git and AI updates often arrive in bursts while navigating;
+        every call within one frame collapses into a single _flush_status.
+        """
+        if self.ui is None:
+            return
+        if self._status_flush_handle is None:
+            self._status_flush_handle = self.set_timer(
+                _STATUS_FLUSH_SECS, self._flush_status
+            )
+
+    def _flush_status(self) -> None:
         """Render the current status message plus AI provider + Git info in the footer."""
-        if not getattr(self, "footer", None):
+        self._status_flush_handle = None
+        ui = self.ui
+        if ui is None:
             return
 
         git_part = self._format_git_status_summary()
@@ -402,7 +881,7 @@ class ShellPilotApp(App):
             text.append(git_part, style="yellow")
 
         # If absolutely nothing was added, keep it empty instead of "None"
-        self.footer.set_message(text if text.plain else "")
+        ui.status.set_message(text if text.plain else "")
 
     # ---------- Trash helpers ----------
     def _init_trash_dir(self) -> tuple[Path, Path]:
@@ -429,7 +908,7 @@ class ShellPilotApp(App):
     def _load_trash_index(self) -> dict[str, dict]:
         """Load JSON index of trashed files -> original paths."""
         try:
-            data = json.loads(self.trash_index_path.read_text())
+            data = _load_json(self.trash_index_path)
             # validate a bit
             if isinstance(data, dict):
                 return data
@@ -439,22 +918,50 @@ class ShellPilotApp(App):
             return {}
         return {}
 
-    def _save_trash_index(self) -> None:
+    def _save_trash_index(self, background: bool = True) -> None:
         """Persist trash index to disk."""
-        try:
-            self.trash_index_path.parent.mkdir(parents=True, exist_ok=True)
-            self.trash_index_path.write_text(json.dumps(self.trash_index, indent=2))
-        except Exception:
-            # don't crash the app if saving fails
-            pass
+        self._persist(self.trash_index_path, _dump_json(self.trash_index), background)
+
+    def _schedule_trash_save(self) -> None:
+        """
+        Mark the trash index dirty and flush it shortly after.
+
+        A burst of trash/restore operations collapses into a single write.
+        """
+        self._trash_index_dirty = True
+        if self._trash_flush_handle is None:
+            self._trash_flush_handle = self.set_timer(0.5, self._flush_trash_index)
+
+    def _flush_trash_index(self, background: bool = True) -> None:
+        """Write the trash index if it has pending changes."""
+        if self._trash_flush_handle is not None:
+            self._trash_flush_handle.stop()
+            self._trash_flush_handle = None
+        if not self._trash_index_dirty:
+            return
+        self._trash_index_dirty = False
+        self._save_trash_index(background)
 
     def _in_trash_view(self) -> bool:
         """Return True if the current directory is the trash directory."""
         try:
-            return self._current_dir().resolve() == self.trash_dir.resolve()
+            return self._current_dir_resolved() == self._trash_dir_resolved
         except Exception:
             return False
 
+    def _is_inside_trash(self, path: Path) -> bool:
+        """Return True if *path* is the trash directory or anything under it."""
+        if path.parent == self._current_dir() and not path.is_symlink():
+            # Listed entry: reuse the memoized resolved directory instead of
+            # walking every path component again
+            resolved = os.path.join(self._current_dir_resolved(), path.name)
+        else:
+            resolved = str(path.resolve())
+        return (
+            resolved == str(self._trash_dir_resolved)
+            or resolved.startswith(self._trash_dir_prefix)
+        )
+
     # ---------- Layout ----------
     def compose(self) -> ComposeResult:
         """Compose the UI layout."""
@@ -462,7 +969,8 @@ class ShellPilotApp(App):
         # MAIN ROW: left | output | preview
         with Horizontal(id="main-row"):
             # LEFT PANE: breadcrumb + search + file list
-            with Vertical(id="left-pane"):
+            with Vertical(id="left-pane") as left_pane:
+                self.left_pane = left_pane
                 self.breadcrumb = Static("", id="breadcrumb")
                 yield self.breadcrumb
 
@@ -476,7 +984,8 @@ class ShellPilotApp(App):
                 yield self.file_list
 
             # MIDDLE: command output / AI output
-            with VerticalScroll(id="output-container"):
+            with VerticalScroll(id="output-container") as output_container:
+                self.output_container = output_container
                 self.output = OutputPanel("No command executed yet.")
                 yield self.output
 
@@ -494,11 +1003,17 @@ class ShellPilotApp(App):
 
     def on_mount(self) -> None:
         """App mounted: show an initial command for the start directory."""
+        self.ui = _UIRefs(
+            output=self.output,
+            preview=self.preview,
+            status=self.footer,
+            breadcrumb=self.breadcrumb,
+        )
+
         self._update_breadcrumb()
-        if self.preview:
-            cmd = build_ls_command(self.start_path)
-            self._last_command = cmd
-            self.preview.show_command(cmd)
+        cmd = build_ls_command(self.start_path)
+        self._last_command = cmd
+        self.ui.preview.show_command(cmd)
 
         # Focus file list by default
         if self.file_list:
@@ -514,33 +1029,38 @@ class ShellPilotApp(App):
         # 🔹 Initialize Git state for the starting directory
         self._refresh_git_state(self._current_dir())
 
+        # GPU detection shells out to nvidia-smi: keep it off the first paint
+        self.call_in_thread(self._detect_gpu_worker)
+
         # Apply persisted help visibility on startup
         if self.preview_container:
             self.preview_container.display = self._help_visible
 
-        try:
-            left_pane = self.query_one("#left-pane", Vertical)
-            output_container = self.query_one("#output-container", VerticalScroll)
-        except Exception:
-            # If the layout hasn't fully settled for some reason, just force a refresh
-            self.refresh(layout=True)
-        else:
-            if self._help_visible:
-                # Three-column mode: left | output | help
-                left_pane.styles.width = "1fr"
-                output_container.styles.width = "1fr"
-            else:
-                # Two-column mode: left | output (help hidden)
-                left_pane.styles.width = "1fr"
-                output_container.styles.width = "2fr"
+        self._apply_column_widths()
+        self.refresh(layout=True)
 
-            self.refresh(layout=True)
+    def on_unmount(self) -> None:
+        """App shutting down: flush pending trash index changes, stop watchers."""
+        # Synchronous: background writer threads would die with the process
+        self._flush_trash_index(background=False)
+        self._flush_session(background=False)
+        self._drain_persist()
+        self._git_watcher.stop()
+        # Queued jobs are moot now; ones already running (e.g. a trash move) finish
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def action_quit(self) -> None:
+        """Flush pending state, then quit."""
+        self._flush_trash_index(background=False)
+        self._flush_session(background=False)
+        await super().action_quit()
 
     def _handle_settings_result(self, result: dict[str, Any] | None) -> None:
         """Callback when Settings dialog is dismissed."""
         if result is None:
             self._set_status("Settings: cancelled.")
             return
+        self._invalidate_preview()
 
         # --- 1) App-level config (Hugging Face token) ---------------------------
         app_cfg = load_config()
@@ -617,7 +1137,8 @@ class ShellPilotApp(App):
         self._set_status("Settings saved (HF + AI provider keys updated).")
 
     # ---------- Helpers ----------
-    def _mask_api_key(self, key: str | None) -> str:
+    @staticmethod
+    def _mask_api_key(key: str | None) -> str:
         """Return a human-friendly masked version of an API key."""
         if not key:
             return "<not set>"
@@ -627,40 +1148,156 @@ class ShellPilotApp(App):
         return f"{key[:4]}…{key[-4:]}"
 
     def _current_dir(self) -> Path:
-        if self.file_list:
+        # `is not None`: an empty ListView is falsy (e.g. while shutting down)
+        if self.file_list is not None:
             return self.file_list.current_path
         return self.start_path
 
+    def _current_dir_resolved(self) -> Path:
+        """Return _current_dir().resolve(), memoized until the directory changes."""
+        current = self._current_dir()
+        cached = self._resolved_dir
+        if cached is not None and cached[0] is current:
+            return cached[1]
+        resolved = current if current == self._trash_dir_resolved else current.resolve()
+        self._resolved_dir = (current, resolved)
+        return resolved
+
     def _update_breadcrumb(self) -> None:
         """Update the breadcrumb display with the current path."""
-        if not self.breadcrumb:
+        ui = self.ui
+        if ui is None:
             return
         path = self._current_dir()
-        self.breadcrumb.update(f"[b]Path:[/b] {path}")
+        ui.breadcrumb.update(f"[b]Path:[/b] {path}")
 
     def _refresh_git_state(self, path: Path) -> None:
         """
-        Update Git state (in/out of repo + status summary) for the given path.
+        Schedule a Git state update (in/out of repo + status summary) for path.
+
+        Calls are debounced so fast navigation coalesces into one probe; the
+        probe itself runs git in a worker thread.
         """
+        now = time.monotonic()
+        self._last_git_path = path
+
+        nav_times = self._git_nav_times
+        nav_times.append(now)
+        while nav_times and now - nav_times[0] > _GIT_BURST_WINDOW:
+            nav_times.popleft()
+        delay = (
+            _GIT_BURST_DEBOUNCE_SECS
+            if len(nav_times) > _GIT_BURST_EVENTS
+            else _GIT_DEBOUNCE_SECS
+        )
+
+        # Never hold a probe back longer than the ceiling
+        if self._git_pending_since is None:
+            self._git_pending_since = now
+        deadline = self._git_pending_since + _GIT_DEBOUNCE_MAX_SECS
+        delay = max(0.0, min(delay, deadline - now))
+
+        if self._git_refresh_timer is not None:
+            self._git_refresh_timer.stop()
+        self._git_refresh_timer = self.set_timer(delay, self._start_git_probe)
+
+    def _start_git_probe(self) -> None:
+        """Debounce expired: probe Git for the most recent path."""
+        self._git_refresh_timer = None
+        self._git_pending_since = None
+        path = self._last_git_path
+        if path is not None:
+            self.call_in_thread(self._git_probe_worker, path)
+
+    def _git_probe_worker(self, path: Path) -> None:
+        """Background worker: run the git subprocesses for path."""
+        dirs = find_git_dirs(path)
+        if dirs is None:
+            # No .git anywhere above us: skip forking git entirely
+            self._watch_git_root(path, None)
+            self.call_from_thread(self._apply_git_state, path, False, None)
+            return
+
+        root, git_dir = dirs
         try:
-            self.in_git_repo = is_git_repo(path)
+            idx_mtime = (git_dir / "index").stat().st_mtime
+            root_mtime = root.stat().st_mtime
+        except OSError:
+            idx_mtime = root_mtime = -1.0
+
+        now = time.monotonic()
+        cached = self._git_cache.get(root)
+        if (
+            cached is not None
+            and cached[0] == idx_mtime
+            and cached[1] == root_mtime
+            and now - cached[2] < _GIT_CACHE_TTL_SECS
+        ):
+            self._watch_git_root(path, root)
+            self.call_from_thread(self._apply_git_state, path, True, cached[3])
+            return
+
+        try:
+            in_repo = is_git_repo(path)
         except Exception:
-            self.in_git_repo = False
+            in_repo = False
 
-        if self.in_git_repo:
+        status: Optional[dict[str, Any]] = None
+        if in_repo:
             try:
-                self.git_status = get_git_status(path)
+                status = get_git_status(path)
             except Exception:
-                self.git_status = None
-        else:
-            self.git_status = None
+                status = None
+            if status is not None:
+                self._git_cache[root] = (idx_mtime, root_mtime, now, status)
+
+        self._watch_git_root(path, root if in_repo else None)
+        self.call_from_thread(self._apply_git_state, path, in_repo, status)
+
+    def _watch_git_root(self, path: Path, root: Optional[Path]) -> None:
+        """
+        Worker side: follow root's work tree so edits refresh the status.
+
+        Scheduling a recursive watch walks the whole tree (one inotify watch
+        per directory), so it runs here rather than on the UI thread.
+        """
+        if path == self._last_git_path:
+            self._git_watcher.watch(root)
+
+    def _invalidate_git_cache(self) -> None:
+        """Forget cached Git status (call after we change the filesystem)."""
+        self._git_cache.clear()
+
+    def _apply_git_state(
+        self,
+        path: Path,
+        in_repo: bool,
+        status: Optional[dict[str, Any]],
+    ) -> None:
+        """Store a finished Git probe, unless the user has already moved on."""
+        if path != self._last_git_path:
+            return
+        self.in_git_repo = in_repo
+        self.git_status = status
 
         # Re-render the status bar with the new Git info
         self._update_status_with_git()
 
+    class GitChanged(Message):
+        """Posted (from the watcher thread) when the watched work tree changes."""
+
+    def on_shell_pilot_app_git_changed(self, message: GitChanged) -> None:
+        """Something in the work tree changed: re-probe (debounced, uncached)."""
+        root = self._git_watcher.root
+        if root is not None:
+            self._git_cache.pop(root, None)
+        if self._last_git_path is not None:
+            self._refresh_git_state(self._last_git_path)
+
     def _set_directory(self, path: Path) -> None:
         """Centralized place to change directory and refresh UI."""
-        if not self.file_list:
+        ui = self.ui
+        if not self.file_list or ui is None:
             return
 
         # Keep old path so we can roll back if we can't enter the new one
@@ -677,49 +1314,47 @@ class ShellPilotApp(App):
             # Roll back to previous directory
             self.file_list.current_path = old_path
 
-            # Figure out who we are + whether we likely have sudo
+            # Figure out who we are (the sudo probe only matters for non-root)
             euid = os.geteuid() if hasattr(os, "geteuid") else -1
-            has_pwless_sudo = _has_passwordless_sudo()
 
-            if self.output:
-                if euid == 0:
-                    # Running as root but still blocked → ACLs / SELinux / mount perms
-                    self.output.update(
-                        "[b]Permission denied listing directory, even as root.[/b]\n\n"
-                        f"Path: {path}\n\n"
-                        "This is likely due to ACLs, SELinux, or special mount options.\n"
-                        "Try:\n"
-                        "  • [code]ls -ld {path}[/code]\n"
-                        "  • [code]getfacl {path}[/code]\n"
-                        "  • [code]ls -Z {path}[/code] (for SELinux)\n"
+            if euid == 0:
+                # Running as root but still blocked → ACLs / SELinux / mount perms
+                ui.output.update(
+                    "[b]Permission denied listing directory, even as root.[/b]\n\n"
+                    f"Path: {path}\n\n"
+                    "This is likely due to ACLs, SELinux, or special mount options.\n"
+                    "Try:\n"
+                    "  • [code]ls -ld {path}[/code]\n"
+                    "  • [code]getfacl {path}[/code]\n"
+                    "  • [code]ls -Z {path}[/code] (for SELinux)\n"
+                )
+                self._set_status("Permission denied entering directory (root)")
+            else:
+                # Non-root user
+                if _has_passwordless_sudo():
+                    hint = (
+                        "It looks like you can use sudo *without* a password.\n\n"
+                        "To inspect this directory, you can run:\n"
+                        f"  [code]sudo ls -l {path}[/code]\n\n"
+                        "Or restart ShellPilot with elevated privileges if you intend "
+                        "to browse protected system directories a lot:\n\n"
+                        "  [code]sudo shellpilot[/code]\n"
                     )
-                    self._set_status("Permission denied entering directory (root)")
                 else:
-                    # Non-root user
-                    if has_pwless_sudo:
-                        hint = (
-                            "It looks like you can use sudo *without* a password.\n\n"
-                            "To inspect this directory, you can run:\n"
-                            f"  [code]sudo ls -l {path}[/code]\n\n"
-                            "Or restart ShellPilot with elevated privileges if you intend "
-                            "to browse protected system directories a lot:\n\n"
-                            "  [code]sudo shellpilot[/code]\n"
-                        )
-                    else:
-                        hint = (
-                            "You do not have permission to list this directory.\n\n"
-                            "To inspect it, try one of:\n"
-                            f"  • [code]sudo ls -l {path}[/code]\n"
-                            f"  • [code]sudo find {path} -maxdepth 1 -ls[/code]\n\n"
-                            "If you frequently need to browse system logs, you may want to "
-                            "run ShellPilot under sudo explicitly."
-                        )
-
-                    self.output.update(
-                        "[b]Permission denied entering directory.[/b]\n\n"
-                        f"Path: {path}\n\n" + hint
+                    hint = (
+                        "You do not have permission to list this directory.\n\n"
+                        "To inspect it, try one of:\n"
+                        f"  • [code]sudo ls -l {path}[/code]\n"
+                        f"  • [code]sudo find {path} -maxdepth 1 -ls[/code]\n\n"
+                        "If you frequently need to browse system logs, you may want to "
+                        "run ShellPilot under sudo explicitly."
                     )
-                    self._set_status("Permission denied entering directory")
+
+                ui.output.update(
+                    "[b]Permission denied entering directory.[/b]\n\n"
+                    f"Path: {path}\n\n" + hint
+                )
+                self._set_status("Permission denied entering directory")
 
             return  # Don't update breadcrumb/session on failure
 
@@ -729,10 +1364,9 @@ class ShellPilotApp(App):
         # Refresh Git state for this directory
         self._refresh_git_state(path)
 
-        if self.preview:
-            cmd = build_ls_command(path)
-            self._last_command = cmd
-            self.preview.show_command(cmd)
+        cmd = build_ls_command(path)
+        self._last_command = cmd
+        ui.preview.show_command(cmd)
 
         # IMPORTANT:
         # Don't touch the output panel here.
@@ -746,7 +1380,7 @@ class ShellPilotApp(App):
 
         self._base_status = ""  # Clear any transient message
         self._update_status_with_git()
-        self._save_session()
+        self._schedule_session_save()
 
     def _get_selected_path(self) -> Optional[Path]:
         """Return the Path of the currently selected item in the file list."""
@@ -759,12 +1393,24 @@ class ShellPilotApp(App):
             item = self.file_list.children[index]
         except IndexError:
             return None
+
+        # Same row, same widget (list not rebuilt) → reuse the Path
+        cached = self._selected_path_cache
+        if cached is not None and cached[0] == index and cached[1] is item:
+            return cached[2]
+
         data = getattr(item, "data", None)
         if not data:
             return None
-        return Path(data)
+        path = Path(data)
+        self._selected_path_cache = (index, item, path)
+        return path
 
     # ---------- Events ----------
+    def on_list_view_highlighted(self, event: ListView.Highlighted) -> None:
+        """Cursor moved: drop the memoized selection."""
+        self._selected_path_cache = None
+
     def on_list_view_selected(self, event: ListView.Selected) -> None:
         """Navigate into directory or preview file content when selection changes."""
         if not self.file_list or not self.preview:
@@ -772,12 +1418,11 @@ class ShellPilotApp(App):
 
         entry_path = Path(event.item.data)
 
-        if entry_path.is_dir():
+        if _item_is_dir(event.item, entry_path):
             # Navigate immediately into the directory
             self._set_directory(entry_path)
         else:
-            # Preview file content immediately
-            self._preview_file(entry_path)
+            self._schedule_preview(entry_path)
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
         """Handle search/filter submission."""
@@ -810,48 +1455,58 @@ class ShellPilotApp(App):
                 self.set_focus(self.file_list)
 
     # ---------- Core preview logic ----------
+    def _schedule_preview(self, entry_path: Path) -> None:
+        """
+        Preview entry_path, coalescing rapid repeats into a single preview.
+
+        A request after a quiet period previews immediately. Requests that
+        arrive while the debounce window is open only record the path; when
+        the window closes, the latest one is previewed if it is still selected.
+        """
+        if self._preview_timer is None:
+            self._pending_preview = None
+            self._preview_file(entry_path)
+        else:
+            self._pending_preview = entry_path
+            self._preview_timer.stop()
+        self._preview_timer = self.set_timer(
+            _PREVIEW_DEBOUNCE_SECS, self._flush_preview
+        )
+
+    def _flush_preview(self) -> None:
+        """Debounce expired: preview the last requested path if still selected."""
+        self._preview_timer = None
+        path = self._pending_preview
+        self._pending_preview = None
+        if path is not None and path == self._get_selected_path():
+            self._preview_file(path)
+
     def _preview_file(self, entry_path: Path) -> None:
         """Shared logic to preview a file (images, binary, code, or plain text)."""
-        if not self.preview:
+        ui = self.ui
+        if ui is None:
             return
 
+        # Same file, unchanged and still on screen: nothing to rebuild
+        shown = self._shown_preview
+        if (
+            shown is not None
+            and shown[0] == entry_path
+            and shown[2] is ui.output.content
+            and shown[3] is self._last_command
+            and shown[1] == _file_signature(entry_path)
+        ):
+            self._set_status(shown[4])
+            return
+
+        self._preview_seq += 1
+        seq = self._preview_seq
+
         suffix = entry_path.suffix.lower()
         is_image = suffix in {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp"}
 
         # 1) Image preview path
         if is_image:
-            if self.output:
-                renderable = None
-
-                # First try rich.image if available
-                try:
-                    from rich.image import Image as RichImage  # type: ignore
-                except ModuleNotFoundError:
-                    # No rich.image; try our Pillow renderer
-                    renderable = pillow_rich_image(entry_path)
-                else:
-                    # rich.image exists; try to render with it
-                    try:
-                        img = RichImage.from_path(str(entry_path))
-                        header = Text(f"[IMAGE] {entry_path.name}", style="bold magenta")
-                        renderable = Group(header, Text("\n"), img)
-                    except Exception:
-                        # If RichImage fails for any reason, fall back to Pillow
-                        renderable = pillow_rich_image(entry_path)
-
-                if renderable is not None:
-                    self.output.update(renderable)
-                    self._set_status(f"Previewing image: {entry_path.name}")
-                else:
-                    self.output.update(
-                        "[b]Image preview not available[/b]\n\n"
-                        "Tried both `rich.image` and a Pillow-based fallback but neither is usable.\n"
-                        "If you haven't already, install Pillow inside your venv:\n"
-                        "  pip install pillow\n\n"
-                        f"File path:\n  {entry_path}"
-                    )
-                    self._set_status(f"Image preview unavailable for: {entry_path.name}")
-
             # For images we don't track code-language preview
             self._last_file_path = None
             self._last_file_language = None
@@ -859,93 +1514,44 @@ class ShellPilotApp(App):
             # Still show a shell-style view command in the help pane
             cmd = build_view_file_command(entry_path)
             self._last_command = cmd
-            self.preview.show_command(cmd)
+            ui.preview.show_command(cmd)
+
+            key = self._preview_cache_key(entry_path, "image")
+            renderable = self._preview_cache.get(key) if key is not None else None
+            if renderable is not None:
+                self._preview_cache.move_to_end(key)
+                self._show_image_preview(entry_path, renderable)
+            else:
+                # Decoding can take a while: do it off the UI thread
+                self._set_status(f"Loading image: {entry_path.name}…")
+                self.call_in_thread(self._image_preview_worker, entry_path, key, seq)
             return
 
         # 2) Binary preview: hex dump instead of mojibake
         is_binary = is_binary_file(entry_path)
-        if is_binary and self.output:
-            dump = hex_dump(entry_path)
-            self.output.show_hexdump(dump, entry_path)
+        if is_binary:
             self._last_file_path = None
             self._last_file_language = None
 
             # In the help pane, show a real hexdump command they can run
-            cmd = ShellCommand(
-                description=f"Hex dump of {entry_path.name}",
-                explanation=(
-                    "This command shows the first part of the file in hex + ASCII:\n"
-                    "  • Offsets on the left\n"
-                    "  • Hex bytes in the middle\n"
-                    "  • Printable characters on the right\n\n"
-                    "Useful for inspecting binaries, compiled files, and unknown formats."
-                ),
-                command=f"hexdump -C -- {entry_path.name}",
-                cwd=entry_path.parent,
-                dangerous=False,
-            )
+            cmd = build_hexdump_command(entry_path)
             self._last_command = cmd
-            self.preview.show_command(cmd)
-            self._set_status(f"Previewing binary (hex): {entry_path.name}")
+            ui.preview.show_command(cmd)
+
+            key = self._preview_cache_key(entry_path, "hex")
+            renderable = self._preview_cache.get(key) if key is not None else None
+            if renderable is not None:
+                self._preview_cache.move_to_end(key)
+                ui.output.update(renderable)
+                self._remember_preview(
+                    entry_path, f"Previewing binary (hex): {entry_path.name}"
+                )
+            else:
+                self.call_in_thread(self._hex_preview_worker, entry_path, key, seq)
             return
 
         # 3) Log preview: use our LogHighlighter instead of generic syntax highlight
-        if is_log_file(entry_path) and self.output:
-            try:
-                text = read_log_text(entry_path)
-            except PermissionError:
-                euid = os.geteuid() if hasattr(os, "geteuid") else -1
-                has_pwless_sudo = _has_passwordless_sudo()
-
-                if euid != 0:
-                    # Not root
-                    if has_pwless_sudo:
-                        hint = (
-                            "It looks like you can use sudo *without* a password.\n"
-                            "You can restart ShellPilot with full access:\n\n"
-                            f"  [code]sudo {os.path.basename(sys.argv[0])}[/code]\n"
-                            "or view this specific log with:\n\n"
-                            f"  [code]sudo less {entry_path}[/code]\n"
-                        )
-                    else:
-                        hint = (
-                            "You are not running as root, so some logs under /var/log "
-                            "or system services may be unreadable.\n\n"
-                            "To see this log, run one of:\n"
-                            f"  • [code]sudo less {entry_path}[/code]\n"
-                            f"  • [code]sudo tail -n 80 {entry_path}[/code]\n"
-                            "or restart ShellPilot with sudo.\n"
-                        )
-
-                    self.output.update(
-                        "[b]Permission denied reading log file.[/b]\n\n"
-                        f"Path: {entry_path}\n\n"
-                        + hint
-                    )
-                    self._set_status("Permission denied for log (not root)")
-                else:
-                    # Root but still denied: SELinux/ACL/etc.
-                    self.output.update(
-                        "[b]Permission denied reading log file, even as root.[/b]\n\n"
-                        f"Path: {entry_path}\n\n"
-                        "This is likely due to SELinux, ACLs, or special journal permissions.\n"
-                        "Check:\n"
-                        "  • getfacl\n"
-                        "  • ls -Z (SELinux context)\n"
-                    )
-                    self._set_status("Permission denied for log (root)")
-                return
-            except Exception as e:
-                self.output.update(
-                    f"[b]Failed to read log file:[/b] {e}\n\nPath: {entry_path}"
-                )
-                self._set_status("Failed to preview log")
-                return
-
-            # Highlight with LogHighlighter
-            rich_text = log_highlighter.highlight_lines(text.splitlines(True))
-            self.output.update(rich_text)
-
+        if is_log_file(entry_path):
             # Don't treat logs as “code files” for re-run behavior
             self._last_file_path = None
             self._last_file_language = None
@@ -955,77 +1561,370 @@ class ShellPilotApp(App):
                 # (unlikely here, but just in case you add CSV logging)
                 pass
             else:
-                cmd = ShellCommand(
-                    description=f"Tail of {entry_path.name}",
-                    explanation=(
-                        "Shows the *end* of the log using `tail -n 80`:\n"
-                        "  • Useful for recent errors or activity\n"
-                        "  • Does not modify the file in any way\n"
-                    ),
-                    command=f"tail -n 80 -- {entry_path.name}",
-                    cwd=entry_path.parent,
-                    dangerous=False,
-                )
+                cmd = build_tail_command(entry_path)
                 self._last_command = cmd
-                self.preview.show_command(cmd)
+                ui.preview.show_command(cmd)
+
+            key = self._preview_cache_key(entry_path, "log")
+            renderable = self._preview_cache.get(key) if key is not None else None
+            if renderable is not None:
+                self._preview_cache.move_to_end(key)
+                ui.output.update(renderable)
+                self._remember_preview(
+                    entry_path, f"Previewing log with highlighting: {entry_path.name}"
+                )
+                return
 
-            self._set_status(f"Previewing log with highlighting: {entry_path.name}")
+            # Highlight with LogHighlighter (created lazily on first log preview)
+            highlighter = self._log_highlighter or LogHighlighter()
+            self._log_highlighter = highlighter
+            self._set_status(f"Loading log: {entry_path.name}…")
+            self.call_in_thread(
+                self._log_preview_worker, entry_path, highlighter, key, seq
+            )
             return
 
         lang = language_for_path(entry_path)
 
         # Choose a helper command based on file type
         if suffix == ".log":
-            cmd = ShellCommand(
-                description=f"Tail of {entry_path.name}",
-                explanation=(
-                    "Shows the *end* of the log using `tail -n 80`:\n"
-                    "  • Useful for recent errors or activity\n"
-                    "  • Does not modify the file in any way\n"
-                ),
-                command=f"tail -n 80 -- {entry_path.name}",
-                cwd=entry_path.parent,
-                dangerous=False,
-            )
+            cmd = build_tail_command(entry_path)
         elif suffix == ".csv":
-            cmd = ShellCommand(
-                description=f"Pretty-print CSV {entry_path.name}",
-                explanation=(
-                    "Shows the first rows of the CSV as a simple table:\n"
-                    "  • `head -n 40` limits output to 40 lines\n"
-                    "  • `column -s, -t` aligns columns on commas\n"
-                    "This is read-only and safe to run."
-                ),
-                command=f"head -n 40 -- {entry_path.name} | column -s, -t",
-                cwd=entry_path.parent,
-                dangerous=False,
+            cmd = build_csv_preview_command(entry_path)
+        else:
+            # Default safe 'view file' helper (your existing behavior)
+            cmd = build_view_file_command(entry_path)
+
+        self._last_command = cmd
+        ui.preview.show_command(cmd)
+
+        if lang is not None:
+            # Syntax-highlighted preview (served from the LRU cache when unchanged)
+            renderable, highlighted = self._code_preview_renderable(entry_path, lang)
+
+            self._last_file_path = entry_path
+            self._last_file_language = lang
+            self._last_file_sig = _file_signature(entry_path)
+            ui.output.show_code_renderable(renderable)
+            if highlighted:
+                self._remember_preview(
+                    entry_path, f"Previewing [{lang}] {entry_path.name}"
+                )
+            else:
+                self._remember_preview(
+                    entry_path, f"Large file: highlighting disabled ({entry_path.name})"
+                )
+        else:
+            # Fallback: run shell preview command (in a worker) and show raw result
+            self._last_file_path = None
+            self._last_file_language = None
+            self._set_status(f"Loading preview: {entry_path.name}…")
+            self.call_in_thread(self._shell_preview_worker, entry_path, cmd, seq)
+
+    def _remember_preview(self, path: Path, status: str) -> None:
+        """Set a finished preview's status and record it as on screen."""
+        self._set_status(status)
+        ui = self.ui
+        if ui is not None:
+            self._shown_preview = (
+                path,
+                _file_signature(path),
+                ui.output.content,
+                self._last_command,
+                status,
+            )
+
+    def _invalidate_preview(self) -> None:
+        """Another view is taking over the output pane: drop in-flight previews."""
+        self._preview_seq += 1
+
+    # ---------- Background previews (images, hex dumps, logs, shell) ----------
+    def _preview_cache_key(self, path: Path, kind: str) -> Optional[tuple]:
+        """Preview-cache key for a non-code preview, or None if it can't be stat'ed."""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (str(path), st.st_mtime_ns, st.st_size, kind)
+
+    def _cache_preview(self, key: tuple, renderable: RenderableType) -> None:
+        """Insert into the preview LRU, evicting the oldest entry if full."""
+        cache = self._preview_cache
+        cache[key] = renderable
+        if len(cache) > _PREVIEW_CACHE_MAX:
+            cache.popitem(last=False)
+
+    @staticmethod
+    def _build_image_renderable(path: Path) -> Optional[RenderableType]:
+        """Decode *path* into a renderable, or None if it can't be rendered."""
+        # First try rich.image if available
+        try:
+            from rich.image import Image as RichImage  # type: ignore
+        except ModuleNotFoundError:
+            # No rich.image; try our Pillow renderer
+            return pillow_rich_image(path)
+
+        # rich.image exists; try to render with it
+        try:
+            img = RichImage.from_path(str(path))
+            header = Text(f"[IMAGE] {path.name}", style="bold magenta")
+            return Group(header, Text("\n"), img)
+        except Exception:
+            # If RichImage fails for any reason, fall back to Pillow
+            return pillow_rich_image(path)
+
+    def _image_preview_worker(self, path: Path, key: Optional[tuple], seq: int) -> None:
+        """Background worker: decode an image preview, then hand it back."""
+        try:
+            renderable = self._build_image_renderable(path)
+        except Exception:
+            renderable = None
+        self.call_from_thread(self._finish_image_preview, path, key, seq, renderable)
+
+    def _finish_image_preview(
+        self,
+        path: Path,
+        key: Optional[tuple],
+        seq: int,
+        renderable: Optional[RenderableType],
+    ) -> None:
+        """
+        Cache a decoded image preview and show it if it is still selected.
+
+        Decoding is the expensive part, so unchanged images are served from
+        the same LRU cache as code previews.
+        """
+        if renderable is not None and key is not None:
+            self._cache_preview(key, renderable)
+
+        if seq == self._preview_seq:
+            self._show_image_preview(path, renderable)
+
+    def _show_image_preview(
+        self, path: Path, renderable: Optional[RenderableType]
+    ) -> None:
+        ui = self.ui
+        if ui is None:
+            return
+
+        if renderable is not None:
+            ui.output.update(renderable)
+            self._remember_preview(path, f"Previewing image: {path.name}")
+        else:
+            ui.output.update(
+                "[b]Image preview not available[/b]\n\n"
+                "Tried both `rich.image` and a Pillow-based fallback but neither is usable.\n"
+                "If you haven't already, install Pillow inside your venv:\n"
+                "  pip install pillow\n\n"
+                f"File path:\n  {path}"
+            )
+            self._set_status(f"Image preview unavailable for: {path.name}")
+
+    def _hex_preview_worker(
+        self, path: Path, key: Optional[tuple], seq: int
+    ) -> None:
+        """Background worker: build + highlight a hex dump, then hand it back."""
+        renderable = OutputPanel.build_hexdump_renderable(
+            hex_dump(path, max_bytes=_HEX_PREVIEW_BYTES), path
+        )
+        self.call_from_thread(self._finish_hex_preview, path, key, seq, renderable)
+
+    def _finish_hex_preview(
+        self,
+        path: Path,
+        key: Optional[tuple],
+        seq: int,
+        renderable: RenderableType,
+    ) -> None:
+        if key is not None:
+            self._cache_preview(key, renderable)
+
+        ui = self.ui
+        if ui is None or seq != self._preview_seq:
+            return
+        ui.output.update(renderable)
+        self._remember_preview(path, f"Previewing binary (hex): {path.name}")
+
+    def _log_preview_worker(
+        self,
+        path: Path,
+        highlighter: LogHighlighter,
+        key: Optional[tuple],
+        seq: int,
+    ) -> None:
+        """Background worker: read + highlight a log tail, then hand it back."""
+        try:
+            result: Any = highlighter.highlight_lines(
+                read_log_tail(path, max_bytes=_LOG_PREVIEW_BYTES)
             )
+        except Exception as e:
+            result = e
+        self.call_from_thread(self._finish_log_preview, path, key, seq, result)
+
+    def _finish_log_preview(
+        self, path: Path, key: Optional[tuple], seq: int, result: Any
+    ) -> None:
+        # Only successful highlights are cached; errors are retried next time
+        if key is not None and not isinstance(result, Exception):
+            self._cache_preview(key, result)
+
+        ui = self.ui
+        if ui is None or seq != self._preview_seq:
+            return
+
+        if isinstance(result, PermissionError):
+            self._show_log_permission_error(path)
+            return
+        if isinstance(result, Exception):
+            ui.output.update(
+                f"[b]Failed to read log file:[/b] {result}\n\nPath: {path}"
+            )
+            self._set_status("Failed to preview log")
+            return
+
+        ui.output.update(result)
+        self._remember_preview(path, f"Previewing log with highlighting: {path.name}")
+
+    def _shell_preview_worker(
+        self, path: Path, cmd: ShellCommand, seq: int
+    ) -> None:
+        """Background worker: run the view command, then hand back its output."""
+        rc, stdout, stderr = run_shell_command(cmd, dry_run=False)
+        self.call_from_thread(
+            self._finish_shell_preview, path, seq, rc, stdout, stderr
+        )
+
+    def _finish_shell_preview(
+        self, path: Path, seq: int, rc: int, stdout: str, stderr: str
+    ) -> None:
+        ui = self.ui
+        if ui is None or seq != self._preview_seq:
+            return
+        ui.output.show_result(stdout, stderr, rc)
+        self._remember_preview(path, f"Previewing file: {path.name}")
+
+    def _show_log_permission_error(self, entry_path: Path) -> None:
+        """Explain why a log couldn't be read and how to get at it."""
+        ui = self.ui
+        if ui is None:
+            return
+
+        euid = os.geteuid() if hasattr(os, "geteuid") else -1
+
+        if euid != 0:
+            # Not root
+            if _has_passwordless_sudo():
+                hint = (
+                    "It looks like you can use sudo *without* a password.\n"
+                    "You can restart ShellPilot with full access:\n\n"
+                    f"  [code]sudo {os.path.basename(sys.argv[0])}[/code]\n"
+                    "or view this specific log with:\n\n"
+                    f"  [code]sudo less {entry_path}[/code]\n"
+                )
+            else:
+                hint = (
+                    "You are not running as root, so some logs under /var/log "
+                    "or system services may be unreadable.\n\n"
+                    "To see this log, run one of:\n"
+                    f"  • [code]sudo less {entry_path}[/code]\n"
+                    f"  • [code]sudo tail -n 80 {entry_path}[/code]\n"
+                    "or restart ShellPilot with sudo.\n"
+                )
+
+            ui.output.update(
+                "[b]Permission denied reading log file.[/b]\n\n"
+                f"Path: {entry_path}\n\n"
+                + hint
+            )
+            self._set_status("Permission denied for log (not root)")
+        else:
+            # Root but still denied: SELinux/ACL/etc.
+            ui.output.update(
+                "[b]Permission denied reading log file, even as root.[/b]\n\n"
+                f"Path: {entry_path}\n\n"
+                "This is likely due to SELinux, ACLs, or special journal permissions.\n"
+                "Check:\n"
+                "  • getfacl\n"
+                "  • ls -Z (SELinux context)\n"
+            )
+            self._set_status("Permission denied for log (root)")
+
+    def _code_preview_renderable(
+        self, path: Path, lang: str
+    ) -> tuple[RenderableType, bool]:
+        """
+        Return (renderable, highlighted) for a code preview of *path*.
+
+        Unchanged files are served from the LRU cache. Files larger than
+        _MAX_HIGHLIGHT_BYTES skip the lexer and show only their first bytes.
+        """
+        st = path.stat()
+        key = (str(path), st.st_mtime_ns, st.st_size, lang)
+        highlighted = st.st_size <= _MAX_HIGHLIGHT_BYTES
+
+        cache = self._preview_cache
+        renderable = cache.get(key)
+        if renderable is not None:
+            cache.move_to_end(key)
+            return renderable, highlighted
+
+        if highlighted and st.st_size > _PREVIEW_HEAD_BYTES:
+            # Show the first chunk now; the full view replaces it when ready
+            head = _read_text_fast(path, limit=_PREVIEW_HEAD_BYTES)
+            head = "".join(head.splitlines(keepends=True)[:_PREVIEW_CHUNK_LINES])
+            if key not in self._preview_pending:
+                self.call_in_thread(self._build_full_preview, path, lang, key)
+            self._preview_pending[key] = self._preview_seq
+            return OutputPanel.build_code_renderable(head, path, lang), highlighted
+
+        if highlighted:
+            text = _read_text_fast(path)
+            renderable = OutputPanel.build_code_renderable(text, path, lang)
         else:
-            # Default safe 'view file' helper (your existing behavior)
-            cmd = build_view_file_command(entry_path)
+            text = _read_text_fast(path, limit=_MAX_HIGHLIGHT_BYTES)
+            renderable = OutputPanel.build_plain_renderable(
+                text,
+                path,
+                f"large file, first {_MAX_HIGHLIGHT_BYTES // 1024} KiB, no highlighting",
+            )
 
-        self._last_command = cmd
-        self.preview.show_command(cmd)
+        self._cache_preview(key, renderable)
+        return renderable, highlighted
 
-        if lang is not None and self.output:
-            # Syntax-highlighted preview
-            try:
-                text = entry_path.read_text(encoding="utf-8")
-            except UnicodeDecodeError:
-                text = entry_path.read_text(errors="replace")
+    def _build_full_preview(self, path: Path, lang: str, key: tuple) -> None:
+        """Background worker: read + lex the whole file, then hand it back."""
+        try:
+            text = _read_text_fast(path)
+            # Lexed in one piece, so constructs spanning many lines (docstrings,
+            # block comments, heredocs) come out right; the UI thread only
+            # lays out the already-styled text
+            renderable = OutputPanel.build_code_renderable(text, path, lang)
+        except Exception:
+            renderable = None
+        self.call_from_thread(self._finish_full_preview, path, key, renderable)
 
-            self._last_file_path = entry_path
-            self._last_file_language = lang
-            self.output.show_code(text, entry_path, lang)
-            self._set_status(f"Previewing [{lang}] {entry_path.name}")
-        else:
-            # Fallback: run shell preview command and show raw result
-            self._last_file_path = None
-            self._last_file_language = None
-            rc, stdout, stderr = run_shell_command(cmd, dry_run=False)
-            if self.output:
-                self.output.show_result(stdout, stderr, rc)
-            self._set_status(f"Previewing file: {entry_path.name}")
+    def _finish_full_preview(
+        self, path: Path, key: tuple, renderable: Optional[RenderableType]
+    ) -> None:
+        """Cache the full preview and swap it in if that file is still shown."""
+        seq = self._preview_pending.pop(key, None)
+        if renderable is None:
+            return
+
+        self._cache_preview(key, renderable)
+
+        # The user may have moved on to another file (or view) in the meantime
+        if (
+            seq == self._preview_seq
+            and self.output
+            and self._last_file_path == path
+            and self._last_file_sig == key[1:3]
+        ):
+            self.output.show_code_renderable(renderable)
+            shown = self._shown_preview
+            if shown is not None and shown[0] == path:
+                # Keep the no-op re-preview check pointing at the full view
+                self._shown_preview = (*shown[:2], self.output.content, *shown[3:])
 
     # ---------- Actions ----------
     def action_open_action_menu(self) -> None:
@@ -1060,17 +1959,32 @@ class ShellPilotApp(App):
 
         # If we have a code file tracked, re-read and re-highlight it
         if self._last_file_path is not None and self._last_file_language is not None:
-            try:
-                text = self._last_file_path.read_text(encoding="utf-8")
-            except UnicodeDecodeError:
-                text = self._last_file_path.read_text(errors="replace")
-            self.output.show_code(
-                text, self._last_file_path, self._last_file_language
+            # Unchanged on disk: put the last code view back without rebuilding it
+            sig = _file_signature(self._last_file_path)
+            if (
+                sig is not None
+                and sig == self._last_file_sig
+                and self.output.redisplay()
+            ):
+                self._set_status(f"Refreshed code view: {self._last_file_path.name}")
+                return
+
+            renderable, highlighted = self._code_preview_renderable(
+                self._last_file_path, self._last_file_language
             )
-            self._set_status(f"Refreshed code view: {self._last_file_path.name}")
+            self._last_file_sig = sig
+            self.output.show_code_renderable(renderable)
+            if highlighted:
+                self._set_status(f"Refreshed code view: {self._last_file_path.name}")
+            else:
+                self._set_status(
+                    f"Refreshed (large file: highlighting disabled): "
+                    f"{self._last_file_path.name}"
+                )
             return
 
         # Otherwise, run the shell command and show its output
+        self._invalidate_preview()
         rc, stdout, stderr = run_shell_command(self._last_command, dry_run=False)
         self.output.show_result(stdout, stderr, rc)
         self._set_status(f"Command finished with exit status {rc}")
@@ -1091,19 +2005,21 @@ class ShellPilotApp(App):
         if entry_path is None:
             return
 
-        if entry_path.is_dir():
+        item = self.file_list.highlighted_child if self.file_list is not None else None
+        if _item_is_dir(item, entry_path):
             self._set_directory(entry_path)
         else:
-            self._preview_file(entry_path)
+            self._schedule_preview(entry_path)
 
     def action_add_bookmark(self) -> None:
         """Bookmark the current directory."""
+        self._invalidate_preview()
         current = self._current_dir()
         if current not in self.bookmarks:
             self.bookmarks.append(current)
         self.current_bookmark_index = self.bookmarks.index(current)
 
-        self._save_session()
+        self._schedule_session_save()
 
         if self.output:
             self.output.update(
@@ -1114,6 +2030,7 @@ class ShellPilotApp(App):
 
     def action_next_bookmark(self) -> None:
         """Jump to the next bookmarked directory."""
+        self._invalidate_preview()
         if not self.bookmarks:
             if self.output:
                 self.output.update(
@@ -1137,8 +2054,12 @@ class ShellPilotApp(App):
         """
         Open the selected file in an external editor.
 
-        Uses $VISUAL, then $EDITOR, then falls back to xdg-open.
+        Uses $VISUAL, then $EDITOR, then falls back to xdg-open. An editor
+        from the environment may be a terminal one (vim, nano), so the app is
+        suspended and it runs on our terminal until it exits; xdg-open hands
+        off to a desktop application and is launched detached.
         """
+        self._invalidate_preview()
         entry_path = self._get_selected_path()
         if entry_path is None or not entry_path.is_file():
             if self.output:
@@ -1148,19 +2069,26 @@ class ShellPilotApp(App):
             self._set_status("Open in editor failed: no file selected")
             return
 
-        editor = (
-            os.environ.get("VISUAL")
-            or os.environ.get("EDITOR")
-            or "xdg-open"
-        )
+        editor = os.environ.get("VISUAL") or os.environ.get("EDITOR")
 
         try:
-            subprocess.Popen([editor, str(entry_path)])
+            # $EDITOR may carry arguments (e.g. "code --wait"); they must be
+            # separate argv entries, not one program name
+            argv = [*shlex.split(editor or "xdg-open"), str(entry_path)]
+            if editor:
+                try:
+                    with self.suspend():
+                        subprocess.run(argv)
+                except SuspendNotSupported:
+                    _spawn_detached(argv)
+            else:
+                _spawn_detached(argv)
+                editor = "xdg-open"
             if self.output:
                 self.output.update(
-                    f"[b]Opening in editor:[/b] {editor} {entry_path}"
+                    f"[b]Opened in editor:[/b] {editor} {entry_path}"
                 )
-            self._set_status(f"Opening in editor: {editor} {entry_path.name}")
+            self._set_status(f"Opened in editor: {editor} {entry_path.name}")
         except Exception as e:
             if self.output:
                 self.output.update(
@@ -1180,29 +2108,31 @@ class ShellPilotApp(App):
         # 2) Resize the main columns (the containers):
         #    - left-pane (breadcrumb + search + file list)
         #    - output-container (command output / code)
-        try:
-            left_pane = self.query_one("#left-pane", Vertical)
-            output_container = self.query_one("#output-container", VerticalScroll)
-        except Exception:
-            # If for some reason the query fails, don't crash the app
+        if self._apply_column_widths():
+            # Ask Textual to recompute layout with new widths
             self.refresh(layout=True)
-            return
 
-        if self._help_visible:
-            # Three-column mode: left | output | help
-            left_pane.styles.width = "1fr"
-            output_container.styles.width = "1fr"
-            # preview-container stays at 1fr via CSS
-        else:
-            # Two-column mode: left | output (help hidden)
-            left_pane.styles.width = "1fr"
-            output_container.styles.width = "2fr"  # or "3fr" if you want it huge
+        # Persist the new state
+        self._schedule_session_save()
 
-        # Ask Textual to recompute layout with new widths
-        self.refresh(layout=True)
+    def _apply_column_widths(self) -> bool:
+        """
+        Size the left/output columns for the current help visibility.
 
-        # Persist the new state
-        self._save_session()
+        Returns True if either width actually changed.
+        """
+        if self.left_pane is None or self.output_container is None:
+            return False
+
+        # Three-column mode: left | output | help (help stays at 1fr via CSS)
+        # Two-column mode: left | output (help hidden)
+        output_width = "1fr" if self._help_visible else "2fr"
+
+        before = (str(self.left_pane.styles.width), str(self.output_container.styles.width))
+        self.left_pane.styles.width = "1fr"
+        self.output_container.styles.width = output_width
+        after = (str(self.left_pane.styles.width), str(self.output_container.styles.width))
+        return before != after
 
     def action_trash_selected(self) -> None:
         """
@@ -1210,6 +2140,7 @@ class ShellPilotApp(App):
 
         This is a safe 'delete': nothing is permanently removed yet.
         """
+        self._invalidate_preview()
         entry_path = self._get_selected_path()
         if entry_path is None:
             if self.output:
@@ -1219,7 +2150,7 @@ class ShellPilotApp(App):
 
         # Don't let people trash the trash
         try:
-            if entry_path.resolve().is_relative_to(self.trash_dir.resolve()):
+            if self._is_inside_trash(entry_path):
                 if self.output:
                     self.output.update(
                         "[b]Trash:[/b] This item is already inside the trash directory."
@@ -1235,38 +2166,125 @@ class ShellPilotApp(App):
             self._set_status("Trash: item not found on disk")
             return
 
-        entry_id = uuid.uuid4().hex
-        trash_name = f"{entry_id}__{entry_path.name}"
-        dest = self.trash_dir / trash_name
+        self._trash_many([entry_path])
 
-        try:
-            shutil.move(str(entry_path), str(dest))
-        except Exception as e:
-            if self.output:
-                self.output.update(f"[b]Failed to move to trash:[/b] {e}")
-            self._set_status("Failed to move to trash (see output)")
+    def _trash_many(self, paths: list[Path]) -> None:
+        """
+        Move several items into the trash as one batch.
+
+        Items that no longer exist or already live in the trash are skipped.
+        The moves run off the UI thread and the file list is refreshed once
+        for the whole batch. Index entries are recorded before the moves
+        start, so an item that lands in the trash after the app has quit
+        can still be restored; entries for failed moves are dropped again.
+        """
+        jobs: list[tuple[Path, Path, str]] = []
+        for path in paths:
+            try:
+                if not path.exists() or self._is_inside_trash(path):
+                    continue
+            except OSError:
+                continue
+            entry_id = uuid.uuid4().hex
+            jobs.append((path, self.trash_dir / f"{entry_id}__{path.name}", entry_id))
+
+        if not jobs:
+            self._set_status("Trash: nothing to move")
             return
 
-        # Record in index
-        self.trash_index[entry_id] = {
-            "orig_path": str(entry_path),
-            "trash_name": trash_name,
-            "name": entry_path.name,
-            "trashed_at": datetime.now().isoformat(timespec="seconds"),
-        }
-        self._save_trash_index()
+        trashed_at = _now_iso()
+        for path, dest, entry_id in jobs:
+            self.trash_index[entry_id] = {
+                "orig_path": str(path),
+                "trash_name": dest.name,
+                "name": path.name,
+                "trashed_at": trashed_at,
+            }
+        self._schedule_trash_save()
 
-        # Refresh current directory
-        self.file_list and self.file_list.refresh_entries()
-        self._set_status(f"Moved to trash: {entry_path}")
+        # Large directories can take a while to move; keep the UI responsive
+        label = jobs[0][0].name if len(jobs) == 1 else f"{len(jobs)} items"
+        self._set_status(f"Moving to trash: {label}…")
+        self.call_in_thread(self._trash_worker, jobs)
+
+    def _trash_worker(self, jobs: list[tuple[Path, Path, str]]) -> None:
+        """Background worker: move a batch into the trash, then report back."""
+        def move(job: tuple[Path, Path, str]) -> Optional[Exception]:
+            try:
+                _move_path(job[0], job[1])
+            except Exception as e:
+                return e
+            return None
+
+        if len(jobs) == 1:
+            results = [move(jobs[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as pool:
+                results = list(pool.map(move, jobs))
+
+        moved = [job for job, err in zip(jobs, results) if err is None]
+        failed = [job[2] for job, err in zip(jobs, results) if err is not None]
+        errors = [f"{job[0]}: {err}" for job, err in zip(jobs, results) if err is not None]
+        self.call_from_thread(self._finalize_trash, moved, failed, errors)
+
+    def _finalize_trash(
+        self,
+        moved: list[tuple[Path, Path, str]],
+        failed: list[str],
+        errors: list[str],
+    ) -> None:
+        """UI-thread half of a trash batch: settle the index and refresh the view."""
+        if failed:
+            # Nothing reached the trash for these: forget their index entries
+            for entry_id in failed:
+                self.trash_index.pop(entry_id, None)
+            self._schedule_trash_save()
+
+        if moved:
+            self._invalidate_git_cache()
+            # Refresh current directory
+            self.file_list and self.file_list.refresh_entries()
+
+        if len(moved) == 1 and not errors:
+            entry_path, dest, _ = moved[0]
+            self._set_status(f"Moved to trash: {entry_path}")
+            if self.output:
+                self.output.update(
+                    "[b]Moved to trash:[/b]\n"
+                    f"- Original: {entry_path}\n"
+                    f"- Trash: {dest}\n\n"
+                    "Use 't' to open the trash, 'r' to restore, and 'E' to empty the trash (while in trash)."
+                )
+            return
+
+        if not moved:
+            if self.output:
+                self.output.update(
+                    "[b]Failed to move to trash:[/b]\n"
+                    + "\n".join(f"- {line}" for line in errors)
+                )
+            self._set_status("Failed to move to trash (see output)")
+            return
 
+        self._set_status(
+            f"Moved {len(moved)} items to trash"
+            + (f" ({len(errors)} failed)" if errors else "")
+        )
         if self.output:
-            self.output.update(
-                "[b]Moved to trash:[/b]\n"
-                f"- Original: {entry_path}\n"
-                f"- Trash: {dest}\n\n"
-                "Use 't' to open the trash, 'r' to restore, and 'E' to empty the trash (while in trash)."
+            text = "[b]Moved to trash:[/b]\n" + "\n".join(
+                f"- {entry_path}" for entry_path, _, _ in moved
             )
+            if errors:
+                text += "\n\n[b]Could not move:[/b]\n" + "\n".join(
+                    f"- {line}" for line in errors
+                )
+            self.output.update(text)
+
+    def _show_trash_error(self, title: str, error: Exception) -> None:
+        """Report a failed trash/restore move in the output pane + status bar."""
+        if self.output:
+            self.output.update(f"[b]{title}:[/b] {error}")
+        self._set_status(f"{title} (see output)")
 
     def action_go_trash(self) -> None:
         """Jump directly to the ShellPilot trash directory."""
@@ -1279,6 +2297,7 @@ class ShellPilotApp(App):
 
         Only works when the current view is the trash directory.
         """
+        self._invalidate_preview()
         if not self._in_trash_view():
             if self.output:
                 self.output.update(
@@ -1335,21 +2354,36 @@ class ShellPilotApp(App):
         # If something already exists at the original path, add a suffix
         restore_path = orig_path
         if restore_path.exists():
-            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            timestamp = time.strftime("%Y%m%d-%H%M%S", time.localtime())
             restore_path = orig_path.with_name(f"{orig_path.name}.restored-{timestamp}")
 
+        self._set_status(f"Restoring: {orig_path.name}…")
+        self.call_in_thread(
+            self._restore_worker, entry_path, restore_path, orig_path, entry_id
+        )
+
+    def _restore_worker(
+        self, entry_path: Path, restore_path: Path, orig_path: Path, entry_id: str
+    ) -> None:
+        """Background worker: move a trashed item back, then report back."""
         try:
-            shutil.move(str(entry_path), str(restore_path))
+            _move_path(entry_path, restore_path)
         except Exception as e:
-            if self.output:
-                self.output.update(f"[b]Restore failed:[/b] {e}")
-            self._set_status("Restore failed (see output)")
+            self.call_from_thread(self._show_trash_error, "Restore failed", e)
             return
+        self.call_from_thread(
+            self._finalize_restore, restore_path, orig_path, entry_id
+        )
 
+    def _finalize_restore(
+        self, restore_path: Path, orig_path: Path, entry_id: str
+    ) -> None:
+        """UI-thread half of a restore: update the index and refresh the view."""
         # Update index
         self.trash_index.pop(entry_id, None)
-        self._save_trash_index()
+        self._schedule_trash_save()
 
+        self._invalidate_git_cache()
         # Refresh trash view
         self.file_list and self.file_list.refresh_entries()
         self._set_status(f"Restored: {restore_path}")
@@ -1365,37 +2399,7 @@ class ShellPilotApp(App):
 
     def action_open_key_help(self) -> None:
         """Show a popup dialog with all key bindings (replacing footer key bar)."""
-        help_text = (
-            "[b]Navigation[/b]\n"
-            "  h              Home (~)\n"
-            "  t              Open trash view\n"
-            "  Left/Right     Up directory / enter / preview\n"
-            "  PageUp/Down    Scroll file list\n"
-            "\n"
-            "[b]Files & Trash[/b]\n"
-            "  Enter          Run last command / refresh preview\n"
-            "  e              Open in editor\n"
-            "  Delete         Move to ShellPilot trash\n"
-            "  r              Restore selected (in trash view)\n"
-            "  E              Empty trash (in trash view)\n"
-            "\n"
-            "[b]Search & Bookmarks[/b]\n"
-            "  /              Focus filter input\n"
-            "  Ctrl+B         Bookmark current directory\n"
-            "  Ctrl+J         Jump to next bookmark\n"
-            "\n"
-            "[b]SENTRA & Command Palette[/b]\n"
-            "  a              Ask SENTRA about the selected file/dir\n"
-            "  : / Ctrl+P     Command palette\n"
-            "\n"
-            "[b]App & UI[/b]\n"
-            "  Ctrl+,         Settings\n"
-            "  ?              Toggle side help panel\n"
-            "  q              Quit ShellPilot\n"
-            "  F1             Show this key help dialog\n"
-        )
-
-        self.push_screen(KeyHelpScreen(help_text))
+        self.push_screen(KeyHelpScreen(_KEY_HELP_TEXT))
 
     def action_empty_trash(self) -> None:
         """
@@ -1403,6 +2407,7 @@ class ShellPilotApp(App):
 
         Only works while viewing the trash directory.
         """
+        self._invalidate_preview()
         if not self._in_trash_view():
             if self.output:
                 self.output.update(
@@ -1413,20 +2418,46 @@ class ShellPilotApp(App):
             return
 
         # Danger, but user explicitly invoked it from trash view
-        errors: list[str] = []
-        for child in self.trash_dir.iterdir():
-            if child == self.trash_index_path:
-                continue
-            try:
-                if child.is_dir():
-                    shutil.rmtree(child)
-                else:
-                    child.unlink()
-            except Exception as e:
-                errors.append(f"{child}: {e}")
+        self._set_status("Emptying trash…")
+        self.call_in_thread(self._empty_trash_worker)
 
-        self.trash_index = {}
-        self._save_trash_index()
+    def _empty_trash_worker(self) -> None:
+        """Background worker: delete every trash entry in parallel."""
+        removed: set[str] = set()
+        errors: list[str] = []
+        index_name = self.trash_index_path.name
+        try:
+            with os.scandir(self.trash_dir) as it:
+                targets = [entry for entry in it if entry.name != index_name]
+        except OSError as e:
+            targets = []
+            errors.append(f"{self.trash_dir}: {e}")
+
+        if targets:
+            # Independent subtrees: overlap the per-inode syscall latency
+            with ThreadPoolExecutor(
+                max_workers=min(_TRASH_DELETE_WORKERS, len(targets))
+            ) as pool:
+                futures = {pool.submit(_remove_entry, entry): entry for entry in targets}
+                for future, entry in futures.items():
+                    exc = future.exception()
+                    if exc is not None:
+                        errors.append(f"{entry.path}: {exc}")
+                    else:
+                        removed.add(entry.name)
+
+        self.call_from_thread(self._finalize_empty_trash, removed, errors)
+
+    def _finalize_empty_trash(self, removed: set[str], errors: list[str]) -> None:
+        """UI-thread half of empty-trash: drop the deleted entries and report."""
+        # Only what was actually deleted: a trash batch that landed after the
+        # worker's snapshot (or failed to delete) stays restorable
+        self.trash_index = {
+            entry_id: meta
+            for entry_id, meta in self.trash_index.items()
+            if meta.get("trash_name") not in removed
+        }
+        self._schedule_trash_save()
         self.file_list and self.file_list.refresh_entries()
 
         if errors:
@@ -1454,10 +2485,10 @@ class ShellPilotApp(App):
         Let the user pick an AI model (small → large).
         If the model file is missing, offer to download it.
         """
+        self._invalidate_preview()
         if not self.output:
             return
 
-        # Load registry via the lazy loader
         registry = get_model_registry()
         model_ids = list(registry.keys())
 
@@ -1489,6 +2520,7 @@ class ShellPilotApp(App):
 
     def action_ai_explain_file(self) -> None:
         """Use the local AI model to explain the currently selected file or directory."""
+        self._invalidate_preview()
         entry_path = self._get_selected_path()
         if entry_path is None:
             self._set_status("SENTRA: no file or directory selected")
@@ -1502,58 +2534,35 @@ class ShellPilotApp(App):
         # --- DIRECTORY PATH ---------------------------------------------------
         if entry_path.is_dir():
             try:
-                manifest = self._build_dir_manifest(entry_path, max_entries=200)
+                manifest, detail = self._inspect_dir(entry_path, max_entries=200)
             except Exception as exc:
                 self._show_ai_error(f"Failed to inspect directory: {exc}")
                 return
 
-            try:
-                entries = list(entry_path.iterdir())
-                total = len(entries)
-                n_dirs = sum(1 for p in entries if p.is_dir())
-                n_files = total - n_dirs
-
-                maybe_exec = 0
-                for p in entries:
-                    try:
-                        st = p.stat()
-                    except OSError:
-                        continue
-                    mode = st.st_mode
-                    if mode & (statmod.S_IXUSR | statmod.S_ISUID | statmod.S_ISGID):
-                        maybe_exec += 1
-
-                detail = (
-                    f"Scanned {total} items in this directory: "
-                    f"{n_files} files, {n_dirs} subdirectories; "
-                    f"{maybe_exec} executable / potentially sensitive entries."
-                )
-            except Exception:
-                detail = "Scanning directory contents and building a short manifest…"
-
             # Stage 1: finished scanning/summarizing
             self._show_ai_progress(entry_path, stage=1, detail=detail)
 
+            # A new request supersedes any job still queued or streaming
+            self._ai_cancel.set()
+            self._ai_cancel = threading.Event()
+
             # Start timing *here* and pass it to the background worker
             started_at = time.perf_counter()
-            self.call_in_thread(
+            self.call_in_ai_thread(
                 self._ai_explain_directory_worker,
                 entry_path,
                 manifest,
                 started_at,          # <── new arg
+                self._ai_cancel,
+                self._ai_task_context(entry_path)[1],
             )
             return
 
         # --- FILE PATH --------------------------------------------------------
         try:
-            max_bytes = 512 * 1024  # 512 KB
-            raw = entry_path.read_bytes()
-            if len(raw) > max_bytes:
-                raw = raw[:max_bytes]
-            try:
-                content = raw.decode("utf-8")
-            except UnicodeDecodeError:
-                content = raw.decode("utf-8", errors="replace")
+            # 4 bytes per char covers worst-case UTF-8 for the chars we keep
+            with entry_path.open("rb", buffering=0) as f:
+                raw = f.read(_AI_MAX_CHARS * 4)
         except PermissionError:
             self._show_ai_error(
                 f"Permission denied reading file: {entry_path}"
@@ -1563,6 +2572,15 @@ class ShellPilotApp(App):
             self._show_ai_error(f"Failed to read file: {exc}")
             return
 
+        # Decoded binary is just noise to the model: say so instead
+        if looks_binary(raw[:_BINARY_SNIFF_BYTES]):
+            self._show_ai_error(
+                f"{entry_path.name} looks like a binary file; "
+                "SENTRA can only explain text files."
+            )
+            return
+        content = raw.decode("utf-8", errors="replace")[:_AI_MAX_CHARS]
+
         approx_chars = len(content)
         detail = (
             f"Read ~{approx_chars} characters from this file; "
@@ -1572,13 +2590,19 @@ class ShellPilotApp(App):
         # Stage 1: finished reading the file
         self._show_ai_progress(entry_path, stage=1, detail=detail)
 
+        # A new request supersedes any job still queued or streaming
+        self._ai_cancel.set()
+        self._ai_cancel = threading.Event()
+
         # Start timing and pass it along
         started_at = time.perf_counter()
-        self.call_in_thread(
+        self.call_in_ai_thread(
             self._ai_explain_file_worker,
             entry_path,
             content,
             started_at,
+            self._ai_cancel,
+            self._ai_task_context(entry_path)[1],
         )
 
     def _move_cursor_page(self, direction: int, page_size: int = 10) -> None:
@@ -1624,56 +2648,129 @@ class ShellPilotApp(App):
         if getattr(self, "output", None) is not None:
             self.output.update(panel)
 
-    def _build_dir_manifest(self, path: Path, max_entries: int = 256) -> str:
-        """Return a short text manifest of a directory tree."""
+    def _inspect_dir(self, path: Path, max_entries: int = 256) -> tuple[str, str]:
+        """
+        Return (manifest, summary line) for a directory explain request.
+
+        The top level is scanned once: the same DirEntry objects feed both
+        the counts and the first level of the manifest. Only the first
+        _AI_SCAN_MAX_STATS entries are stat'ed for mode bits.
+        """
+        dirs: list[os.DirEntry] = []
+        files: list[os.DirEntry] = []
+        maybe_exec = 0
+        with os.scandir(path) as it:
+            for n, entry in enumerate(it, 1):
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (dirs if is_dir else files).append(entry)
+                if n > _AI_SCAN_MAX_STATS:
+                    continue
+                try:
+                    mode = entry.stat().st_mode
+                except OSError:
+                    continue
+                if mode & (statmod.S_IXUSR | statmod.S_ISUID | statmod.S_ISGID):
+                    maybe_exec += 1
+
+        total = len(dirs) + len(files)
+        if total > _AI_SCAN_MAX_STATS:
+            exec_note = (
+                f"≥{maybe_exec} executable / potentially sensitive entries "
+                f"(first {_AI_SCAN_MAX_STATS} checked)."
+            )
+        else:
+            exec_note = f"{maybe_exec} executable / potentially sensitive entries."
+        detail = (
+            f"Scanned {total} items in this directory: "
+            f"{len(files)} files, {len(dirs)} subdirectories; {exec_note}"
+        )
+
+        manifest = self._build_dir_manifest(path, max_entries, top_level=(dirs, files))
+        return manifest, detail
+
+    def _build_dir_manifest(
+        self,
+        path: Path,
+        max_entries: int = 256,
+        top_level: Optional[tuple[list[os.DirEntry], list[os.DirEntry]]] = None,
+    ) -> str:
+        """Return a short text manifest of a directory tree.
+
+        Walks breadth-first with os.scandir and stops as soon as max_entries
+        lines have been emitted, so huge trees are never fully traversed.
+        top_level, if given, is the already-scanned (dirs, files) of path.
+        """
         lines: list[str] = []
-        base = path
-
-        for root, dirs, files in os.walk(base):
-            rel_root = os.path.relpath(root, base)
-            rel_root = "." if rel_root == "." else rel_root
-
-            for d in sorted(dirs):
-                if len(lines) >= max_entries:
-                    break
-                entry = d if rel_root == "." else f"{rel_root}/{d}"
-                lines.append(f"[DIR]  {entry}")
-
-            for f in sorted(files):
-                if len(lines) >= max_entries:
-                    break
-                entry = f if rel_root == "." else f"{rel_root}/{f}"
-                lines.append(f"      {entry}")
-
-            if len(lines) >= max_entries:
-                lines.append(f"... (truncated after {max_entries} entries)")
+        queue: deque[tuple[str, str]] = deque([("", str(path))])
+        truncated = False
+
+        while queue and not truncated:
+            rel_root, current = queue.popleft()
+
+            if top_level is not None:
+                dirs, files = top_level
+                top_level = None
+            else:
+                dirs = []
+                files = []
+                try:
+                    with os.scandir(current) as it:
+                        for entry in it:
+                            try:
+                                is_dir = entry.is_dir()
+                            except OSError:
+                                is_dir = False
+                            (dirs if is_dir else files).append(entry)
+                except OSError:
+                    continue
+
+            # Only the first `remaining` names can be emitted: partial sort
+            remaining = max_entries - len(lines)
+            for d in heapq.nsmallest(remaining, dirs, key=_entry_name):
+                rel = f"{rel_root}{d.name}"
+                lines.append(f"[DIR]  {rel}")
+                # Like os.walk: list symlinked dirs, but don't descend into them
+                if not d.is_symlink():
+                    queue.append((f"{rel}/", d.path))
+            if len(dirs) > remaining:
+                truncated = True
                 break
 
+            remaining = max_entries - len(lines)
+            for f in heapq.nsmallest(remaining, files, key=_entry_name):
+                lines.append(f"      {rel_root}{f.name}")
+            if len(files) > remaining:
+                truncated = True
+
+        if truncated:
+            lines.append(f"... (truncated after {max_entries} entries)")
+
         return "\n".join(lines) if lines else "(directory is empty)"
 
-    def _show_ai_progress(self, path: Path, stage: int, detail: str | None = None) -> None:
+    def _get_ai_engine(self) -> Any:
         """
-        Render a friendly, step-based 'AI is working' panel.
+        Return the shared local AI engine, creating it on first use.
 
-        stage:
-          1 = just finished reading/summarizing
-          2 = currently running the LLM
-          3 = finished and formatting (usually very brief)
-        detail:
-          Optional human-readable line about what we're doing right now.
+        Failures are not cached, so a retry after fixing the setup works.
         """
-        if not self.output:
-            return
-
-        def mark(n: int, label: str) -> str:
-            if stage > n:
-                prefix = "✅"
-            elif stage == n:
-                prefix = "⏳"
-            else:
-                prefix = " •"
-            return f"{prefix} [b]Step {n}/3:[/b] {label}"
-        
+        engine = self._ai_engine
+        if engine is not None:
+            return engine
+        with self._ai_engine_lock:
+            if self._ai_engine is None:
+                # Deferred: importing the engine loads llama-cpp's native library
+                from shellpilot.ai.engine import get_engine
+
+                self._ai_engine = get_engine()
+            return self._ai_engine
+
+    def _ai_progress_context(
+        self, path: Path
+    ) -> tuple[str, str, str, tuple[str, str, str]]:
+        """Return (provider, kind, thread status line, stage labels) for an AI task."""
         is_dir = path.is_dir()
         kind = "directory" if is_dir else "file"
 
@@ -1688,7 +2785,7 @@ class ShellPilotApp(App):
             gpu_mode = False
 
             try:
-                engine = get_engine()
+                engine = self._get_ai_engine()
                 threads = getattr(engine, "n_threads", None)
             except Exception:
                 engine = None
@@ -1710,43 +2807,59 @@ class ShellPilotApp(App):
                     thread_status = (
                         f"🧠 Local model on GPU (offload) + {threads} CPU threads for sampling"
                     )
-                elif threads >= 12:
-                    thread_status = f"🔥 Using {threads} CPU threads (high performance, local)"
-                elif threads >= 8:
-                    thread_status = f"🚀 Using {threads} CPU threads (local)"
-                elif threads >= 4:
-                    thread_status = f"⚙️  Using {threads} CPU threads (local)"
                 else:
-                    thread_status = f"🐢 Using {threads} CPU thread (local, limited mode)"
+                    tier = bisect.bisect_right(self._AI_THREAD_TIER_BOUNDS, threads)
+                    thread_status = self._AI_THREAD_TIERS[tier].format(n=threads)
         else:
-            provider_name = {
-                "gpt": "OpenAI GPT",
-                "gemini": "Google Gemini",
-                "copilot": "GitHub Copilot",
-                "selfhost": "self-hosted OpenAI backend",
-            }.get(provider, provider)
+            provider_name = self._AI_PROVIDER_LABELS.get(provider, provider)
             thread_status = f"🌐 Using remote {provider_name} backend"
 
-        if provider == "local":
-            step2_label = "Analyze with local AI model"
-        elif provider == "gpt":
-            step2_label = "Analyze with OpenAI GPT"
-        elif provider == "gemini":
-            step2_label = "Analyze with Google Gemini"
-        elif provider == "copilot":
-            step2_label = "Analyze with GitHub Copilot"
-        elif provider == "selfhost":
-            step2_label = "Analyze with self-hosted backend"
-        else:
-            step2_label = "Analyze with configured AI provider"
+        step2_label = self._AI_STEP2_LABELS.get(
+            provider, "Analyze with configured AI provider"
+        )
+        labels = (self._AI_STAGE_LABELS[0], step2_label, self._AI_STAGE_LABELS[2])
+
+        return provider, kind, thread_status, labels
+
+    def _ai_task_context(
+        self, path: Path, fresh: bool = False
+    ) -> tuple[Path, str, str, str, tuple[str, str, str]]:
+        """
+        Return the cached _ai_progress_context for path (rebuilt if fresh).
+
+        Provider, engine and labels can't change mid-task: they are worked
+        out when a task starts and reused by its later stages and workers.
+        """
+        ctx = self._ai_progress_ctx
+        if fresh or ctx is None or ctx[0] != path:
+            ctx = (path, *self._ai_progress_context(path))
+            self._ai_progress_ctx = ctx
+        return ctx
+
+    def _show_ai_progress(self, path: Path, stage: int, detail: str | None = None) -> None:
+        """
+        Render a friendly, step-based 'AI is working' panel.
+
+        stage:
+          1 = just finished reading/summarizing
+          2 = currently running the LLM
+          3 = finished and formatting (usually very brief)
+        detail:
+          Optional human-readable line about what we're doing right now.
+        """
+        if not self.output:
+            return
+
+        _, _, kind, thread_status, labels = self._ai_task_context(path, fresh=stage == 1)
 
         lines: list[str] = [
             f"[b]SENTRA explain ({kind}):[/b] {path}",
             f"[dim]{thread_status}[/dim]",
             "",
-            mark(1, "Read and summarize contents"),
-            mark(2, step2_label),
-            mark(3, "Organize explanation for display"),
+        ]
+        lines += [
+            f"{'✅' if stage > n else '⏳' if stage == n else ' •'} [b]Step {n}/3:[/b] {label}"
+            for n, label in enumerate(labels, 1)
         ]
 
         if detail:
@@ -1761,9 +2874,12 @@ class ShellPilotApp(App):
         ]
 
         body = "\n".join(lines)
-
-        from rich.panel import Panel
+        shown = self._ai_progress_shown
+        if shown is not None and shown[0] == body and self.output.content is shown[1]:
+            # Same panel is still on screen: skip the re-layout and repaint
+            return
         panel = Panel.fit(body, title="SENTRA is working…", border_style="cyan")
+        self._ai_progress_shown = (body, panel)
 
         self.output.update(panel)
         self._set_status(f"SENTRA: analyzing {kind} {path.name} (stage {stage}/3)")
@@ -1774,6 +2890,7 @@ class ShellPilotApp(App):
         """
         from shellpilot.ai.engine import get_engine, set_engine_model
 
+        self._invalidate_preview()
         target = target.strip()
         if not target:
             self._set_status("AI: missing model id/index.")
@@ -1810,6 +2927,7 @@ class ShellPilotApp(App):
         # 2) If the model file already exists, just switch in-place
         if model_path.is_file():
             set_engine_model(model_id)
+            self._ai_engine = None
 
             # Mark provider as local and remember the chosen model
             cfg = load_ai_config()
@@ -1839,20 +2957,42 @@ class ShellPilotApp(App):
 
         self._set_status(f"AI: downloading {spec.name}…")
 
+        progress_head = f"[b]Downloading AI model:[/b] {spec.name}\n\n"
+        progress_tail = (
+            "\n\n[dim]You can continue browsing while the model downloads.[/dim]"
+        )
+        # Chunks arrive far faster than the panel needs repainting, and from
+        # several download threads at once: only repaint every
+        # _DOWNLOAD_PROGRESS_SECS, every 0.5%, and at the end
+        progress_lock = threading.Lock()
+        last_emit = 0.0
+        last_pct = -1.0
+
+        def show_progress(text: str) -> None:
+            if self.output:
+                self.output.update(text)
+
         def progress_cb(downloaded: int, total: int) -> None:
+            nonlocal last_emit, last_pct
             if not self.output or not total:
                 return
             pct = (downloaded / total) * 100.0
+            now = time.monotonic()
+            with progress_lock:
+                if (
+                    downloaded < total
+                    and now - last_emit < _DOWNLOAD_PROGRESS_SECS
+                    and pct - last_pct < 0.5
+                ):
+                    return
+                last_emit = now
+                last_pct = pct
+
             mb_done = downloaded / (1024 * 1024)
             mb_total = total / (1024 * 1024)
-
             self.call_from_thread(
-                lambda: self.output.update(
-                    f"[b]Downloading AI model:[/b] {spec.name}\n\n"
-                    f"{mb_done:.1f} / {mb_total:.1f} MiB ({pct:.1f}%)\n"
-                    "\n"
-                    "[dim]You can continue browsing while the model downloads.[/dim]"
-                )
+                show_progress,
+                f"{progress_head}{mb_done:.1f} / {mb_total:.1f} MiB ({pct:.1f}%){progress_tail}",
             )
 
         def worker() -> None:
@@ -1866,6 +3006,7 @@ class ShellPilotApp(App):
                     engine.download_model(progress_cb=progress_cb)
 
                 set_engine_model(model_id)
+                self._ai_engine = None
 
                 # Remember that we're using local models and which one
                 cfg = load_ai_config()
@@ -1898,22 +3039,25 @@ class ShellPilotApp(App):
                 )
 
         # Kick off the download/switch in a background thread
-        self.call_in_thread(worker)
+        self.call_in_daemon_thread(worker)
 
     def _ai_explain_file_worker(
         self,
         path: Path,
         content: str,
         started_at: float | None = None,
+        cancel: threading.Event | None = None,
+        provider: str | None = None,
     ) -> None:
         """Background worker: run the AI backend on a file, then post the result."""
-        settings = get_effective_ai_settings()
-        provider = settings.get("provider", "local")
+        if provider is None:
+            provider = get_effective_ai_settings().get("provider", "local")
+        approx_chars = len(content)
 
         if provider == "local":
             # --- Local GGUF path ----------------------------------------------
             try:
-                engine = get_engine()
+                engine = self._get_ai_engine()
             except FileNotFoundError as exc:
                 self.call_from_thread(self._show_ai_error, str(exc))
                 if started_at is not None:
@@ -1944,14 +3088,21 @@ class ShellPilotApp(App):
             )
 
             try:
-                approx_chars = len(content)
                 detail = (
                     f"Feeding ~{approx_chars} characters of source text into the model "
                     "and generating a structured explanation…"
                 )
                 self.call_from_thread(self._show_ai_progress, path, 2, detail)
 
-                answer = engine.analyze_file(path, content)
+                stream = getattr(engine, "analyze_file_stream", None)
+                if stream is not None:
+                    answer = self._consume_ai_stream(
+                        path, stream(path, content), cancel
+                    )
+                    if answer is None:
+                        return
+                else:
+                    answer = engine.analyze_file(path, content)
             except Exception as exc:
                 self.call_from_thread(self._show_ai_error, f"AI inference error: {exc}")
                 if started_at is not None:
@@ -1965,12 +3116,13 @@ class ShellPilotApp(App):
 
         else:
             # --- Remote provider path -----------------------------------------
-            provider_label = {
-                "gpt": "OpenAI GPT",
-                "gemini": "Google Gemini",
-                "copilot": "GitHub Copilot",
-                "selfhost": "self-hosted backend",
-            }.get(provider, provider)
+            from shellpilot.ai.remote import (
+                analyze_file_remote,
+                RemoteAICancelled,
+                RemoteAIError,
+            )
+
+            provider_label = self._AI_PROVIDER_LABELS.get(provider, provider)
 
             self.call_from_thread(
                 self._show_ai_progress,
@@ -1980,14 +3132,16 @@ class ShellPilotApp(App):
             )
 
             try:
-                approx_chars = len(content)
                 detail = (
                     f"Sending ~{approx_chars} characters to {provider_label} and "
                     "waiting for a response…"
                 )
                 self.call_from_thread(self._show_ai_progress, path, 2, detail)
 
-                answer = analyze_file_remote(provider, path, content)
+                answer = analyze_file_remote(provider, path, content, cancel)
+            except RemoteAICancelled:
+                self.call_from_thread(self._show_ai_cancelled, path, "")
+                return
             except RemoteAIError as exc:
                 self.call_from_thread(self._show_ai_error, str(exc))
                 if started_at is not None:
@@ -2039,14 +3193,17 @@ class ShellPilotApp(App):
         path: Path,
         manifest: str,
         started_at: float | None = None,
+        cancel: threading.Event | None = None,
+        provider: str | None = None,
     ) -> None:
         """Background worker: run the AI backend on a directory manifest."""
-        settings = get_effective_ai_settings()
-        provider = settings.get("provider", "local")
+        if provider is None:
+            provider = get_effective_ai_settings().get("provider", "local")
+        approx_lines = manifest.count("\n") + 1
 
         if provider == "local":
             try:
-                engine = get_engine()
+                engine = self._get_ai_engine()
             except FileNotFoundError as exc:
                 self.call_from_thread(self._show_ai_error, str(exc))
                 if started_at is not None:
@@ -2068,7 +3225,6 @@ class ShellPilotApp(App):
                     )
                 return
 
-            approx_lines = manifest.count("\n") + 1
             self.call_from_thread(
                 self._show_ai_progress,
                 path,
@@ -2078,7 +3234,15 @@ class ShellPilotApp(App):
             )
 
             try:
-                answer = engine.analyze_directory(path, manifest)
+                stream = getattr(engine, "analyze_directory_stream", None)
+                if stream is not None:
+                    answer = self._consume_ai_stream(
+                        path, stream(path, manifest), cancel
+                    )
+                    if answer is None:
+                        return
+                else:
+                    answer = engine.analyze_directory(path, manifest)
             except Exception as exc:
                 self.call_from_thread(self._show_ai_error, f"AI inference error: {exc}")
                 if started_at is not None:
@@ -2091,14 +3255,14 @@ class ShellPilotApp(App):
                 return
 
         else:
-            provider_label = {
-                "gpt": "OpenAI GPT",
-                "gemini": "Google Gemini",
-                "copilot": "GitHub Copilot",
-                "selfhost": "self-hosted backend",
-            }.get(provider, provider)
-
-            approx_lines = manifest.count("\n") + 1
+            from shellpilot.ai.remote import (
+                analyze_directory_remote,
+                RemoteAICancelled,
+                RemoteAIError,
+            )
+
+            provider_label = self._AI_PROVIDER_LABELS.get(provider, provider)
+
             self.call_from_thread(
                 self._show_ai_progress,
                 path,
@@ -2108,7 +3272,10 @@ class ShellPilotApp(App):
             )
 
             try:
-                answer = analyze_directory_remote(provider, path, manifest)
+                answer = analyze_directory_remote(provider, path, manifest, cancel)
+            except RemoteAICancelled:
+                self.call_from_thread(self._show_ai_cancelled, path, "")
+                return
             except RemoteAIError as exc:
                 self.call_from_thread(self._show_ai_error, str(exc))
                 if started_at is not None:
@@ -2147,6 +3314,89 @@ class ShellPilotApp(App):
 
         self.call_from_thread(self._show_ai_success, path, answer, elapsed)
 
+    def _consume_ai_stream(
+        self,
+        path: Path,
+        chunks: Iterator[str],
+        cancel: threading.Event | None = None,
+    ) -> Optional[str]:
+        """
+        Drain a streamed AI answer, repainting the output pane as it grows.
+
+        Runs in the worker thread. Returns the full answer, or None if the
+        user cancelled (the partial answer stays on screen).
+        """
+        parts: list[str] = []
+        pending = 0
+        last_flush = time.perf_counter()
+
+        for chunk in chunks:
+            if cancel is not None and cancel.is_set():
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    close()
+                self.call_from_thread(self._show_ai_cancelled, path, "".join(parts))
+                return None
+
+            parts.append(chunk)
+            pending += 1
+            now = time.perf_counter()
+            if pending >= _AI_STREAM_FLUSH_CHUNKS or now - last_flush >= _AI_STREAM_FLUSH_SECS:
+                self.call_from_thread(self._append_ai_chunk, path, "".join(parts))
+                pending = 0
+                last_flush = now
+
+        return "".join(parts).strip()
+
+    def _ai_markdown(self, text: str) -> RenderableType:
+        """
+        Return a Markdown renderable for an AI answer, reusing the last one.
+
+        Markdown parses its whole source up front; a cancelled answer (or a
+        flush that added no text) re-shows exactly the text of the previous
+        repaint, so that parse is skipped.
+        """
+        last = self._ai_markdown_last
+        if last is not None and last[0] == text:
+            return last[1]
+        md = _markdown(text)
+        self._ai_markdown_last = (text, md)
+        return md
+
+    def _append_ai_chunk(self, path: Path, text: str) -> None:
+        """Show the partial AI answer received so far."""
+        # Markdown always fills the width, so plain Panel renders the same
+        # as Panel.fit here without a measuring pass over the whole answer
+        # (same for the cancelled and success panels below)
+        if self.output:
+            self.output.update(
+                Panel(
+                    self._ai_markdown(text),
+                    title=f"SENTRA · {path.name} (streaming… Esc to cancel)",
+                    border_style="cyan",
+                )
+            )
+
+    def _show_ai_cancelled(self, path: Path, partial: str) -> None:
+        """Render whatever the model produced before the user cancelled."""
+        self._set_status(f"SENTRA: cancelled analysis of {path.name}")
+        if self.output:
+            self.output.update(
+                Panel(
+                    Group(
+                        Text("Cancelled.", style="dim"),
+                        Text(""),
+                        self._ai_markdown(partial),
+                    ),
+                    title=f"SENTRA · {path.name}",
+                    border_style="yellow",
+                )
+            )
+
+    def action_ai_cancel(self) -> None:
+        """Stop a streaming AI answer early (or drop a queued one)."""
+        self._ai_cancel.set()
+
     def _show_ai_error(self, message: str) -> None:
         """Render an AI-related error in the output pane + status bar."""
         self._set_status(f"SENTRA: {message}")
@@ -2174,12 +3424,12 @@ class ShellPilotApp(App):
                 content = Group(
                     timing,
                     Text(""),          # blank line
-                    Markdown(answer),  # AI response as markdown
+                    self._ai_markdown(answer),  # AI response as markdown
                 )
             else:
-                content = Markdown(answer)
+                content = self._ai_markdown(answer)
 
-            panel = Panel.fit(
+            panel = Panel(
                 content,
                 title=f"SENTRA · {path.name}",
                 border_style="cyan",
@@ -2200,19 +3450,17 @@ class ShellPilotApp(App):
         """
         Show a list of AI models, their indices, install status, and which one is active.
         """
-        from shellpilot.ai.config import load_ai_config
-
+        self._invalidate_preview()
         if not self.output:
             return
 
-        # Ensure registry is loaded
         registry = get_model_registry()
         model_ids = list(registry.keys())
 
         engine = None
         current_id = None
         try:
-            engine = get_engine()
+            engine = self._get_ai_engine()
             current_id = getattr(engine, "model_id", None)
         except Exception:
             current_id = None
@@ -2261,10 +3509,11 @@ class ShellPilotApp(App):
             self._set_status("AI: no models to list.")
             return
 
+        installed_ids = get_installed_model_ids()
         for idx, model_id in enumerate(model_ids, start=1):
             spec = registry[model_id]
             path = get_model_path(model_id)
-            installed = path.is_file()
+            installed = model_id in installed_ids
 
             is_current = (model_id == current_id)
             status_parts = []
@@ -2305,6 +3554,7 @@ class ShellPilotApp(App):
 
         Only stores keys on first use; later calls won't overwrite.
         """
+        self._invalidate_preview()
         provider = provider.lower()
         if provider not in {"gpt", "gemini", "copilot"}:
             self._set_status(f"AI: unknown provider '{provider}'")
@@ -2360,6 +3610,7 @@ class ShellPilotApp(App):
             )
 
     def _handle_aimodel_provider_switch(self, provider: str) -> None:
+        self._invalidate_preview()
         provider = provider.lower()
 
         # --- Switch back to local llama engine ---
@@ -2456,90 +3707,102 @@ class ShellPilotApp(App):
         if result is None:
             return  # user cancelled with Esc
 
-        from shellpilot.core import fs_browser
-
         action = result.get("action")
+        handler = self._ACTION_MENU_HANDLERS.get(action)
+        if handler is None:
+            self._set_status(f"Unknown command: {action}")
+            return
 
         try:
-            if action == "rename":
-                target = self.get_current_entry_path()
-                if not target:
-                    self._set_status("No file selected to rename.")
-                    return
-                new_name = result["new_name"]
-                new_path = fs_browser.rename_entry(target, new_name)
-                self._set_status(f"Renamed to {new_path.name}")
-
-            elif action == "chmod":
-                target = self.get_current_entry_path()
-                if not target:
-                    self._set_status("No file selected to chmod.")
-                    return
-                mode_str = result["mode"]
-                mode = int(mode_str, 8)  # e.g. "755" -> 0o755
-                fs_browser.chmod_entry(target, mode)
-                self._set_status(f"chmod {mode_str} {target.name}")
-
-            elif action == "mkdir":
-                parent = self.get_current_directory()
-                name = result["name"]
-                new_dir = fs_browser.mkdir_entry(parent, name)
-                self._set_status(f"Created directory {new_dir.name}")
-
-            elif action == "touch":
-                parent = self.get_current_directory()
-                name = result["name"]
-                new_file = fs_browser.touch_entry(parent / name)
-                self._set_status(f"Touched {new_file.name}")
-
-            elif action == "aimodel":
-                target = (result.get("target") or "").strip()
-                if not target:
-                    self._set_status("AI: missing model id/index for 'aimodel'")
-                    return
-                self._handle_aimodel(target)
-                return  # no FS change, no need to refresh browser
+            if handler(self, result):
+                # refresh directory listing after FS-changing operations
+                self.refresh_browser()
+        except Exception as exc:
+            # eventually we can route this to OutputPanel too
+            self._set_status(f"[error] {exc}")
 
-            elif action == "aimodels":
-                self._show_ai_model_list()
-                return  # listing only, no refresh
+    # ---------- Action menu handlers ----------
+    # Each takes the menu result and returns True if the listing must refresh
 
-            elif action == "aimodel_provider":
-                provider = (result.get("provider") or "").strip()
-                api_key = (result.get("api_key") or "").strip()
-                self._handle_aimodel_provider(provider, api_key)
-                return
+    def _menu_rename(self, result: dict[str, Any]) -> bool:
+        target = self.get_current_entry_path()
+        if not target:
+            self._set_status("No file selected to rename.")
+            return False
+        new_path = fs_browser.rename_entry(target, result["new_name"])
+        self._set_status(f"Renamed to {new_path.name}")
+        return True
 
-            elif action == "aimodel_provider_switch":
-                provider = (result.get("provider") or "").strip()
-                self._handle_aimodel_provider_switch(provider)
-                return
+    def _menu_chmod(self, result: dict[str, Any]) -> bool:
+        target = self.get_current_entry_path()
+        if not target:
+            self._set_status("No file selected to chmod.")
+            return False
+        mode_str = result["mode"]
+        mode = int(mode_str, 8)  # e.g. "755" -> 0o755
+        fs_browser.chmod_entry(target, mode)
+        self._set_status(f"chmod {mode_str} {target.name}")
+        return True
+
+    def _menu_mkdir(self, result: dict[str, Any]) -> bool:
+        parent = self.get_current_directory()
+        new_dir = fs_browser.mkdir_entry(parent, result["name"])
+        self._set_status(f"Created directory {new_dir.name}")
+        return True
+
+    def _menu_touch(self, result: dict[str, Any]) -> bool:
+        parent = self.get_current_directory()
+        new_file = fs_browser.touch_entry(parent / result["name"])
+        self._set_status(f"Touched {new_file.name}")
+        return True
+
+    def _menu_aimodel(self, result: dict[str, Any]) -> bool:
+        target = (result.get("target") or "").strip()
+        if not target:
+            self._set_status("AI: missing model id/index for 'aimodel'")
+            return False
+        self._handle_aimodel(target)
+        return False  # no FS change, no need to refresh browser
 
-            elif action == "aimodel_selfhost":
-                url = (result.get("url") or "").strip()
-                api_key = (result.get("api_key") or "").strip()
-                self._handle_aimodel_selfhost(url or None, api_key or None)
-                return
+    def _menu_ai_models(self, result: dict[str, Any]) -> bool:
+        self._show_ai_model_list()
+        return False  # listing only, no refresh
 
-            elif action == "ai_status":
-                self._show_ai_model_list()
-                return  
-            
-            elif action == "settings":
-                self.action_open_settings()
-                return
+    def _menu_aimodel_provider(self, result: dict[str, Any]) -> bool:
+        provider = (result.get("provider") or "").strip()
+        api_key = (result.get("api_key") or "").strip()
+        self._handle_aimodel_provider(provider, api_key)
+        return False
 
+    def _menu_aimodel_provider_switch(self, result: dict[str, Any]) -> bool:
+        provider = (result.get("provider") or "").strip()
+        self._handle_aimodel_provider_switch(provider)
+        return False
 
-            else:
-                self._set_status(f"Unknown command: {action}")
-                return
+    def _menu_aimodel_selfhost(self, result: dict[str, Any]) -> bool:
+        url = (result.get("url") or "").strip()
+        api_key = (result.get("api_key") or "").strip()
+        self._handle_aimodel_selfhost(url or None, api_key or None)
+        return False
 
-            # refresh directory listing after FS-changing operations
-            self.refresh_browser()
+    def _menu_settings(self, result: dict[str, Any]) -> bool:
+        self.action_open_settings()
+        return False
 
-        except Exception as exc:
-            # eventually we can route this to OutputPanel too
-            self._set_status(f"[error] {exc}")
+    # action name → handler; see _handle_action_menu_result
+    _ACTION_MENU_HANDLERS = {
+        "rename": _menu_rename,
+        "chmod": _menu_chmod,
+        "mkdir": _menu_mkdir,
+        "touch": _menu_touch,
+        "aimodel": _menu_aimodel,
+        "aimodels": _menu_ai_models,
+        "ai_status": _menu_ai_models,
+        "aimodel_provider": _menu_aimodel_provider,
+        "aimodel_provider_switch": _menu_aimodel_provider_switch,
+        "aimodel_selfhost": _menu_aimodel_selfhost,
+        "settings": _menu_settings,
+    }
 
     def _handle_aimodel_selfhost(self, url: Optional[str], api_key: Optional[str]) -> None:
         """
@@ -2548,6 +3811,7 @@ class ShellPilotApp(App):
         - `: aimodel selfhost <URL> <APIKEY>` → configure + switch
         - `: aimodel selfhost`                → just switch to already-configured selfhost
         """
+        self._invalidate_preview()
         cfg = load_ai_config()
 
         url = (url or "").strip().rstrip("/")
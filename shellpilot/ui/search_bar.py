@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from dataclasses import replace
+
 from textual.widget import Widget
 from textual.message import Message
-from textual.reactive import reactive
 from textual.containers import Horizontal
 from textual.widgets import Input, Static
 
@@ -53,7 +54,18 @@ class SearchBar(Widget):
 
         pass
 
-    query = reactive(SearchQuery())
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Current query; replaced (never mutated) so a submitted one stays put
+        self._query = SearchQuery()
+        # Label widgets, looked up once in on_mount
+        self._mode_label: Static | None = None
+        self._type_label: Static | None = None
+        self._case_label: Static | None = None
+        # A label repaint is already scheduled; see _set_query
+        self._labels_dirty = False
+        # (mode, type, case) label texts currently shown
+        self._last_labels: tuple[str, str, str] | None = None
 
     def compose(self):
         yield Horizontal(
@@ -68,78 +80,80 @@ class SearchBar(Widget):
         )
 
     def on_mount(self):
+        self._mode_label = self.query_one("#mode-label", Static)
+        self._type_label = self.query_one("#type-label", Static)
+        self._case_label = self.query_one("#case-label", Static)
         self._update_labels()
-        self.query = self.query  # trigger reactive update
 
-    def watch_query(self, query: SearchQuery) -> None:
-        self._update_labels()
+    def _set_query(self, query: SearchQuery) -> None:
+        """Switch to query; labels repaint once after the current refresh."""
+        self._query = query
+        if not self._labels_dirty:
+            self._labels_dirty = True
+            self.call_after_refresh(self._update_labels)
 
     def _update_labels(self) -> None:
-        mode_label = self.query.mode.name.capitalize()
-        type_label = self.query.type_filter.name.capitalize()
-        case_label = "on" if self.query.case_sensitive else "off"
-
-        self.query_one("#mode-label", Static).update(mode_label)
-        self.query_one("#type-label", Static).update(type_label)
-        self.query_one("#case-label", Static).update(case_label)
+        self._labels_dirty = False
+        if self._mode_label is None:
+            return
+        query = self._query
+        labels = (
+            query.mode.name.capitalize(),
+            query.type_filter.name.capitalize(),
+            "on" if query.case_sensitive else "off",
+        )
+        last = self._last_labels or ("", "", "")
+        # Only touch widgets whose text changed (each update() re-renders)
+        for widget, text, old in zip(
+            (self._mode_label, self._type_label, self._case_label), labels, last
+        ):
+            if text != old:
+                widget.update(text)
+        self._last_labels = labels
 
     # ---- Keyboard handling ----
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
-        text = event.value or ""
-        self.query = SearchQuery(
-            text=text,
-            mode=self.query.mode,
-            type_filter=self.query.type_filter,
-            case_sensitive=self.query.case_sensitive,
-        )
-        self.post_message(self.Submitted(self, self.query))
+        self._set_query(replace(self._query, text=event.value or ""))
+        self.post_message(self.Submitted(self, self._query))
 
     def on_input_key(self, event: Input.Key) -> None:
+        query = self._query
         if event.key == "escape":
             # Clear everything and cancel
-            self.query = SearchQuery()
+            self._set_query(SearchQuery())
             self.post_message(self.Cancelled(self))
             event.stop()
         elif event.key == "f2":
-            self.query = SearchQuery(
-                text=self.query.text,
-                mode=_next_mode(self.query.mode),
-                type_filter=self.query.type_filter,
-                case_sensitive=self.query.case_sensitive,
-            )
+            self._set_query(replace(query, mode=_next_mode(query.mode)))
             event.stop()
         elif event.key == "f3":
-            self.query = SearchQuery(
-                text=self.query.text,
-                mode=self.query.mode,
-                type_filter=_next_type(self.query.type_filter),
-                case_sensitive=self.query.case_sensitive,
-            )
+            self._set_query(replace(query, type_filter=_next_type(query.type_filter)))
             event.stop()
         elif event.key == "f4":
-            self.query = SearchQuery(
-                text=self.query.text,
-                mode=self.query.mode,
-                type_filter=self.query.type_filter,
-                case_sensitive=not self.query.case_sensitive,
-            )
+            self._set_query(replace(query, case_sensitive=not query.case_sensitive))
             event.stop()
 
 
+def _cycle(order: tuple) -> dict:
+    """Map each item of order to the one after it (wrapping around)."""
+    return dict(zip(order, order[1:] + order[:1]))
+
+
+# F2 / F3 step to the next search mode / type filter
+_NEXT_MODE = _cycle((SearchMode.PLAIN, SearchMode.FUZZY, SearchMode.REGEX))
+_NEXT_TYPE = _cycle((
+    FileTypeFilter.ANY,
+    FileTypeFilter.CODE,
+    FileTypeFilter.TEXT,
+    FileTypeFilter.IMAGE,
+    FileTypeFilter.DIR,
+))
+
+
 def _next_mode(mode: SearchMode) -> SearchMode:
-    order = [SearchMode.PLAIN, SearchMode.FUZZY, SearchMode.REGEX]
-    idx = order.index(mode)
-    return order[(idx + 1) % len(order)]
+    return _NEXT_MODE[mode]
 
 
 def _next_type(t: FileTypeFilter) -> FileTypeFilter:
-    order = [
-        FileTypeFilter.ANY,
-        FileTypeFilter.CODE,
-        FileTypeFilter.TEXT,
-        FileTypeFilter.IMAGE,
-        FileTypeFilter.DIR,
-    ]
-    idx = order.index(t)
-    return order[(idx + 1) % len(order)]
+    return _NEXT_TYPE[t]
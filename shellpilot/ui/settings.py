@@ -67,7 +67,16 @@ class SettingsScreen(ModalScreen[dict[str, Any] | None]):
     }
     """
 
+    def _add_input(self, field: str, **kwargs: Any) -> Input:
+        """Create an Input and remember it as the source of result[field]."""
+        widget = Input(**kwargs)
+        self._inputs[field] = widget
+        return widget
+
     def compose(self) -> ComposeResult:
+        # Result field → its Input, so Save doesn't have to query the DOM
+        self._inputs: dict[str, Input] = {}
+
         cfg = load_config()
         ai_cfg = load_ai_config()
 
@@ -93,7 +102,8 @@ class SettingsScreen(ModalScreen[dict[str, Any] | None]):
                 "Hugging Face access token (for gated GGUF downloads):",
                 id="hf-token-label",
             )
-            yield Input(
+            yield self._add_input(
+                "hf_token",
                 value=hf_token,
                 password=True,
                 placeholder="hf_XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX",
@@ -102,7 +112,8 @@ class SettingsScreen(ModalScreen[dict[str, Any] | None]):
 
             # --- OpenAI / GPT ----------------------------------------------------
             yield Static("OpenAI API key (GPT):", id="openai-label")
-            yield Input(
+            yield self._add_input(
+                "openai_api_key",
                 value=openai_key,
                 password=True,
                 placeholder="sk-...",
@@ -111,7 +122,8 @@ class SettingsScreen(ModalScreen[dict[str, Any] | None]):
 
             # --- Google Gemini ---------------------------------------------------
             yield Static("Google Gemini API key:", id="gemini-label")
-            yield Input(
+            yield self._add_input(
+                "gemini_api_key",
                 value=gemini_key,
                 password=True,
                 placeholder="AIza...",
@@ -120,7 +132,8 @@ class SettingsScreen(ModalScreen[dict[str, Any] | None]):
 
             # --- GitHub Copilot --------------------------------------------------
             yield Static("GitHub Copilot API token (if using a custom gateway):", id="copilot-label")
-            yield Input(
+            yield self._add_input(
+                "copilot_api_key",
                 value=copilot_key,
                 password=True,
                 placeholder="ghp_...",
@@ -134,7 +147,8 @@ class SettingsScreen(ModalScreen[dict[str, Any] | None]):
             )
 
             yield Static("Base URL (e.g. http://127.0.0.1:8000/v1):", id="selfhost-url-label")
-            yield Input(
+            yield self._add_input(
+                "selfhost_base_url",
                 value=selfhost_base_url,
                 password=False,
                 placeholder="http://HOST:PORT/v1",
@@ -142,7 +156,8 @@ class SettingsScreen(ModalScreen[dict[str, Any] | None]):
             )
 
             yield Static("Default model id:", id="selfhost-model-label")
-            yield Input(
+            yield self._add_input(
+                "selfhost_model",
                 value=selfhost_model,
                 password=False,
                 placeholder="deepseek-ai/DeepSeek-R1-Distill-Llama-8B",
@@ -150,7 +165,8 @@ class SettingsScreen(ModalScreen[dict[str, Any] | None]):
             )
 
             yield Static("Self-host API key (if required):", id="selfhost-key-label")
-            yield Input(
+            yield self._add_input(
+                "selfhost_api_key",
                 value=selfhost_api_key,
                 password=True,
                 placeholder="(optional; some backends ignore this)",
@@ -168,23 +184,10 @@ class SettingsScreen(ModalScreen[dict[str, Any] | None]):
             return
 
         if event.button.id == "btn-save":
-            hf_input = self.query_one("#hf-token-input", Input)
-            openai_input = self.query_one("#openai-input", Input)
-            gemini_input = self.query_one("#gemini-input", Input)
-            copilot_input = self.query_one("#copilot-input", Input)
-            selfhost_url_input = self.query_one("#selfhost-url-input", Input)
-            selfhost_model_input = self.query_one("#selfhost-model-input", Input)
-            selfhost_key_input = self.query_one("#selfhost-key-input", Input)
-
             self.dismiss(
                 {
-                    "hf_token": hf_input.value.strip() or None,
-                    "openai_api_key": openai_input.value.strip() or None,
-                    "gemini_api_key": gemini_input.value.strip() or None,
-                    "copilot_api_key": copilot_input.value.strip() or None,
-                    "selfhost_base_url": selfhost_url_input.value.strip() or None,
-                    "selfhost_model": selfhost_model_input.value.strip() or None,
-                    "selfhost_api_key": selfhost_key_input.value.strip() or None,
+                    field: widget.value.strip() or None
+                    for field, widget in self._inputs.items()
                 }
             )
 
@@ -2,6 +2,7 @@
 from __future__ import annotations
 from pathlib import Path
 from typing import Any, Optional
+from functools import lru_cache
 import os
 import stat as statmod
 import pwd
@@ -9,8 +10,11 @@ import grp
 import fnmatch
 import re
 
-from rich.syntax import Syntax
-from rich.console import Group
+from rich.color import Color, blend_rgb
+from rich.console import Console, ConsoleOptions, Group, RenderableType, RenderResult
+from rich.measure import Measurement
+from rich.segment import Segment
+from rich.style import Style
 from rich.text import Text
 
 from textual.widgets import Static, ListView, ListItem
@@ -18,22 +22,39 @@ from textual.widgets import Static, ListView, ListItem
 from shellpilot.core.fs_browser import list_dir
 from shellpilot.core.commands import ShellCommand
 from shellpilot.utils.ls_colors import style_for_path
-from shellpilot.core.search import SearchQuery, SearchMode, FileTypeFilter, fuzzy_score
+from shellpilot.core.search import SearchQuery, SearchMode, FileTypeFilter, fuzzy_candidates, fuzzy_scores
 from shellpilot.utils.preview import (
     is_code_file,
     is_text_file,
     is_image_file,
 )
 
+@lru_cache(maxsize=256)
+def _user_name(uid: int) -> str:
+    """Owner name for uid (NSS lookups can read /etc/passwd, so memoize)."""
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+@lru_cache(maxsize=256)
+def _group_name(gid: int) -> str:
+    try:
+        return grp.getgrgid(gid).gr_name
+    except KeyError:
+        return str(gid)
+
 def format_mode(mode: int) -> str:
     """Return a string like '-rw-r--r--'."""
     return statmod.filemode(mode)
 
-def icon_for_entry(path: Path) -> str:
-    """Return a simple icon based on file type."""
-    if path.is_dir():
+def icon_for_entry(
+    path: Path, is_dir: Optional[bool] = None, is_link: Optional[bool] = None
+) -> str:
+    """Return a simple icon based on file type (pass known flags to skip stats)."""
+    if is_dir if is_dir is not None else path.is_dir():
         return "📁"
-    if path.is_symlink():
+    if is_link if is_link is not None else path.is_symlink():
         return "🔗"
 
     suffix = path.suffix.lower()
@@ -56,6 +77,10 @@ class FileList(ListView):
         self._search_query: SearchQuery = SearchQuery(
             mode=SearchMode.FUZZY
         )
+        # (dir, dir mtime_ns, entries, names) from the last non-recursive load
+        self._listing: Optional[tuple[Path, int, list[Path], list[str]]] = None
+        # (context, query text, matched entries) from the last narrowable filter
+        self._last_match: Optional[tuple[tuple, str, list[Path]]] = None
         super().__init__(*args, **kwargs)
 
     def on_mount(self) -> None:
@@ -110,17 +135,13 @@ class FileList(ListView):
             parent = None
 
         if parent is not None and not recursive:
+            parent_mode: Optional[int] = None
             try:
                 st = parent.stat()
+                parent_mode = st.st_mode
                 mode_str = format_mode(st.st_mode)
-                try:
-                    owner = pwd.getpwuid(st.st_uid).pw_name
-                except KeyError:
-                    owner = str(st.st_uid)
-                try:
-                    group = grp.getgrgid(st.st_gid).gr_name
-                except KeyError:
-                    group = str(st.st_gid)
+                owner = _user_name(st.st_uid)
+                group = _group_name(st.st_gid)
 
             except Exception:
                 mode_str = "d?????????"
@@ -129,7 +150,7 @@ class FileList(ListView):
 
             meta = f"{mode_str} {owner:8} {group:8} dir  "
 
-            parent_style = style_for_path(parent)
+            parent_style = style_for_path(parent, parent_mode)
             if parent_style:
                 name_part = f"[{parent_style}]📁 ..[/{parent_style}]"
             else:
@@ -139,45 +160,55 @@ class FileList(ListView):
 
             item = ListItem(Static(label))
             item.data = str(parent)
+            item.is_dir = True
             self.append(item)
 
         if not recursive:
-            for entry in list_dir(current):
-                if not self._matches_filter(entry):
-                    continue
-
+            entries, names = self._load_listing(current)
+            ctx = (current, self._listing[1], False)
+            prev = self._previous_matches(ctx)
+            if prev is not None:
+                entries, names = prev, [e.name for e in prev]
+
+            matched = self._filter_entries(entries, names)
+            self._remember_matches(ctx, matched)
+
+            for entry in matched:
+                # lstat first: one syscall for non-links, and it tells us about links
+                is_link = False
                 try:
-                    st = entry.stat()
+                    st = entry.lstat()
+                    if statmod.S_ISLNK(st.st_mode):
+                        is_link = True
+                        st = entry.stat()
                 except FileNotFoundError:
+                    st = None
                     mode_str = "??????????"
                     owner = "?"
                     group = "?"
                 else:
                     mode_str = format_mode(st.st_mode)
-                    try:
-                        owner = pwd.getpwuid(st.st_uid).pw_name
-                    except KeyError:
-                        owner = str(st.st_uid)
-                    try:
-                        group = grp.getgrgid(st.st_gid).gr_name
-                    except KeyError:
-                        group = str(st.st_gid)
+                    owner = _user_name(st.st_uid)
+                    group = _group_name(st.st_gid)
 
-                if entry.is_dir():
+                # Derive the type from the stat() above instead of re-stat'ing
+                mode = st.st_mode if st is not None else None
+                is_dir = mode is not None and statmod.S_ISDIR(mode)
+                if is_dir:
                     ftype = "dir"
-                elif entry.is_symlink():
+                elif is_link:
                     ftype = "link"
-                elif entry.is_file():
+                elif mode is not None and statmod.S_ISREG(mode):
                     ftype = "file"
                 else:
                     ftype = "other"
 
-                icon = icon_for_entry(entry)
-                name_display = f"{entry.name}/" if entry.is_dir() else entry.name
+                icon = icon_for_entry(entry, is_dir, is_link)
+                name_display = f"{entry.name}/" if is_dir else entry.name
 
                 meta = f"{mode_str} {owner:8} {group:8} {ftype:5}"
 
-                style = style_for_path(entry)
+                style = style_for_path(entry, mode, is_link)
                 if style:
                     name_part = f"[{style}]{icon} {name_display}[/{style}]"
                 else:
@@ -187,56 +218,61 @@ class FileList(ListView):
 
                 item = ListItem(Static(label))
                 item.data = str(entry)
+                # Entry type as seen at listing time, so selection needn't stat
+                item.is_dir = is_dir
                 self.append(item)
 
         else:
             max_results = 1000
             count = 0
+            matched: list[Path] = []
 
-            for root, dirs, files in os.walk(current):
-                root_path = Path(root)
-                names = sorted(dirs) + sorted(files)
-
-                for name in names:
-                    entry = root_path / name
-
-                    if not self._matches_filter(entry):
-                        continue
+            ctx = (current, None, True)
+            prev = self._previous_matches(ctx)
+            if prev is not None:
+                batches = iter([(prev, [e.name for e in prev])])
+            else:
+                batches = self._walk_batches(current)
 
+            for entries, names in batches:
+                for entry in self._filter_entries(entries, names):
+                    # lstat first: one syscall for non-links, and it tells us about links
+                    is_link = False
                     try:
-                        st = entry.stat()
+                        st = entry.lstat()
+                        if statmod.S_ISLNK(st.st_mode):
+                            is_link = True
+                            st = entry.stat()
                     except FileNotFoundError:
+                        st = None
                         mode_str = "??????????"
                         owner = "?"
                         group = "?"
                     else:
                         mode_str = format_mode(st.st_mode)
-                        try:
-                            owner = pwd.getpwuid(st.st_uid).pw_name
-                        except KeyError:
-                            owner = str(st.st_uid)
-                        try:
-                            group = grp.getgrgid(st.st_gid).gr_name
-                        except KeyError:
-                            group = str(st.st_gid)
-
-                    if entry.is_dir():
+                        owner = _user_name(st.st_uid)
+                        group = _group_name(st.st_gid)
+
+                    # Derive the type from the stat() above instead of re-stat'ing
+                    mode = st.st_mode if st is not None else None
+                    is_dir = mode is not None and statmod.S_ISDIR(mode)
+                    if is_dir:
                         ftype = "dir"
-                    elif entry.is_symlink():
+                    elif is_link:
                         ftype = "link"
-                    elif entry.is_file():
+                    elif mode is not None and statmod.S_ISREG(mode):
                         ftype = "file"
                     else:
                         ftype = "other"
 
-                    icon = icon_for_entry(entry)
+                    icon = icon_for_entry(entry, is_dir, is_link)
                     rel = entry.relative_to(current)
                     rel_str = rel.as_posix()
-                    name_display = f"{rel_str}/" if entry.is_dir() else rel_str
+                    name_display = f"{rel_str}/" if is_dir else rel_str
 
                     meta = f"{mode_str} {owner:8} {group:8} {ftype:5}"
 
-                    style = style_for_path(entry)
+                    style = style_for_path(entry, mode, is_link)
                     if style:
                         name_part = f"[{style}]{icon} {name_display}[/{style}]"
                     else:
@@ -246,7 +282,9 @@ class FileList(ListView):
 
                     item = ListItem(Static(label))
                     item.data = str(entry)
+                    item.is_dir = is_dir
                     self.append(item)
+                    matched.append(entry)
 
                     count += 1
                     if count >= max_results:
@@ -255,7 +293,101 @@ class FileList(ListView):
                 if count >= max_results:
                     break
 
-    def _matches_filter(self, path: Path) -> bool:
+            # A truncated result set can't be narrowed: later matches were never seen
+            if count < max_results:
+                self._remember_matches(ctx, matched)
+            else:
+                self._last_match = None
+
+    @staticmethod
+    def _walk_batches(current: Path):
+        """Yield (entries, names) per directory under current, for recursive search."""
+        for root, dirs, files in os.walk(current):
+            root_path = Path(root)
+            names = sorted(dirs) + sorted(files)
+            yield [root_path / name for name in names], names
+
+    def _match_context(self, ctx: tuple) -> tuple:
+        q = self._search_query
+        return ctx + (q.mode, q.case_sensitive, q.type_filter)
+
+    def _narrowable_text(self) -> Optional[str]:
+        """
+        Return the query text if matches can only shrink as it grows.
+
+        That holds for a single plain substring: anything containing "abc"
+        also contains "ab". Fuzzy scores, regexes, globs and multi-token
+        (OR / exclude) queries aren't monotone, so they always rescan.
+        """
+        q = self._search_query
+        raw = (q.text or "").strip()
+        if q.mode is not SearchMode.PLAIN or not raw:
+            return None
+        if raw.startswith("-") or any(ch in raw for ch in " \t*?[]"):
+            return None
+        return raw
+
+    def _previous_matches(self, ctx: tuple) -> Optional[list[Path]]:
+        """
+        Return the last matches if the query only grew by appended
+        characters in the same context, so only those need rechecking.
+        """
+        last = self._last_match
+        raw = self._narrowable_text()
+        if last is None or raw is None:
+            return None
+
+        last_ctx, last_text, last_matches = last
+        if last_ctx != self._match_context(ctx) or not raw.startswith(last_text):
+            return None
+        return last_matches
+
+    def _remember_matches(self, ctx: tuple, matched: list[Path]) -> None:
+        raw = self._narrowable_text()
+        if raw is not None:
+            self._last_match = (self._match_context(ctx), raw, matched)
+        else:
+            self._last_match = None
+
+    def invalidate_listing(self) -> None:
+        """Forget the cached directory listing (after a known FS change)."""
+        self._listing = None
+        self._last_match = None
+
+    def _load_listing(self, current: Path) -> tuple[list[Path], list[str]]:
+        """Return (entries, names) for current, reusing the last load if unchanged."""
+        try:
+            mtime_ns = current.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = -1
+
+        cached = self._listing
+        if cached is not None and cached[0] == current and cached[1] == mtime_ns:
+            return cached[2], cached[3]
+
+        entries = list_dir(current)
+        names = [e.name for e in entries]
+        self._listing = (current, mtime_ns, entries, names)
+        return entries, names
+
+    def _filter_entries(self, entries: list[Path], names: list[str]) -> list[Path]:
+        """Apply the current SearchQuery, scoring fuzzy names in one batch."""
+        q = self._search_query
+        raw = (q.text or "").strip()
+
+        if q.mode is SearchMode.FUZZY and raw:
+            idx = fuzzy_candidates(raw, names, case_sensitive=q.case_sensitive)
+            scores = fuzzy_scores(
+                raw, [names[i] for i in idx], case_sensitive=q.case_sensitive
+            )
+            return [
+                entries[i] for i, score in zip(idx, scores)
+                if score >= 0.55 and self._matches_filter(entries[i], check_name=False)
+            ]
+
+        return [e for e in entries if self._matches_filter(e)]
+
+    def _matches_filter(self, path: Path, check_name: bool = True) -> bool:
         q = getattr(self, "_search_query", SearchQuery())
 
         if q.type_filter is not FileTypeFilter.ANY:
@@ -273,7 +405,7 @@ class FileList(ListView):
                     return False
 
         raw = (q.text or "").strip()
-        if not raw:
+        if not raw or not check_name:
             return True
 
         name = path.name
@@ -288,8 +420,7 @@ class FileList(ListView):
             return pattern.search(name) is not None
 
         if q.mode is SearchMode.FUZZY:
-            score = fuzzy_score(raw, name, case_sensitive=case_sensitive)
-            return score >= 0.55
+            return fuzzy_scores(raw, [name], case_sensitive=case_sensitive)[0] >= 0.55
 
         tokens = raw.split()
         include_patterns: list[str] = []
@@ -387,9 +518,114 @@ class CommandPreview(Static):
         )
         self.update(text)
 
+# rich.syntax pulls in pygments; import it with the first code preview
+_Syntax: Any = None
+
+def _load_syntax() -> Any:
+    """Return rich.syntax.Syntax, importing it on first use."""
+    global _Syntax
+    if _Syntax is None:
+        from rich.syntax import Syntax as _Syntax
+    return _Syntax
+
+# Resolved pygments lexers by name. Given a name, Syntax calls
+# get_lexer_by_name on every render; an instance is reused.
+_LEXER_CACHE: dict[str, Any] = {}
+
+def _get_lexer(language: str) -> Any:
+    """Return a shared pygments lexer for *language*, or the name if unknown."""
+    lexer = _LEXER_CACHE.get(language)
+    if lexer is None:
+        from pygments.lexers import get_lexer_by_name
+        from pygments.util import ClassNotFound
+
+        try:
+            # Same options Syntax itself would use (its default tab_size is 4)
+            lexer = get_lexer_by_name(language, stripnl=False, ensurenl=True, tabsize=4)
+        except ClassNotFound:
+            return language
+        _LEXER_CACHE[language] = lexer
+    return lexer
+
+class _RenderedText:
+    """
+    A styled Text that keeps its rendered lines for the width it was last
+    drawn at, so a cached preview shown again skips lexing and layout.
+    """
+
+    def __init__(self, text: Text) -> None:
+        self.text = text
+        self._width = -1
+        self._lines: list[list[Segment]] = []
+
+    def __rich_measure__(
+        self, console: Console, options: ConsoleOptions
+    ) -> Measurement:
+        return Measurement.get(console, options, self.text)
+
+    def __rich_console__(
+        self, console: Console, options: ConsoleOptions
+    ) -> RenderResult:
+        if options.max_width != self._width:
+            self._lines = console.render_lines(
+                self.text, options.update(height=None), pad=False
+            )
+            self._width = options.max_width
+        new_line = Segment.line()
+        for index, line in enumerate(self._lines):
+            if index:
+                yield new_line
+            yield from line
+
+def _highlight_code(code: str, language: str, line_numbers: bool = True) -> Text:
+    """
+    Lex code into a styled Text, like a monokai Syntax with word_wrap=False
+    (and a line-number gutter unless line_numbers is False).
+
+    A Syntax lexes the whole file every time it is rendered (on the UI
+    thread, on every repaint); this Text is styled once, so it can be built
+    in a worker and cached.
+    """
+    Syntax = _load_syntax()
+    from pygments.token import Token
+
+    syntax = Syntax(code, _get_lexer(language), theme="monokai", word_wrap=False)
+    # Normalised the way Syntax does before lexing
+    ends_on_nl = code.endswith("\n")
+    processed = (code if ends_on_nl else code + "\n").expandtabs(syntax.tab_size)
+    lines = syntax.highlight(processed).split("\n", allow_blank=ends_on_nl)
+
+    theme = Syntax.get_theme("monokai")
+    base = theme.get_background_style()
+    # Syntax's gutter colour: the text colour faded 70% into the background
+    number_style = base + Style(
+        color=Color.from_triplet(
+            blend_rgb(
+                base.bgcolor.get_truecolor(),
+                theme.get_style_for_token(Token.Text).color.get_truecolor(),
+                cross_fade=0.3,
+            )
+        )
+    )
+    digits = len(str(len(lines)))
+
+    # justify="left" pads every line to the full width in the background
+    # style; no_wrap + crop matches word_wrap=False
+    body = Text(style=base, justify="left", no_wrap=True, overflow="crop", end="")
+    for number, line in enumerate(lines, 1):
+        if number > 1:
+            body.append("\n")
+        if line_numbers:
+            body.append(f"  {number:>{digits}} ", number_style)
+        body.append_text(line)
+    return body
+
 class OutputPanel(Static):
     """Displays real command execution results OR syntax-highlighted code."""
 
+    # Last code preview shown, so an unchanged file can be re-shown cheaply
+    _last_code: Optional[RenderableType] = None
+
     def show_result(self, stdout: str, stderr: str, rc: int) -> None:
         text = f"[b]Exit status:[/b] {rc}\n\n"
         if stdout:
@@ -400,39 +636,56 @@ class OutputPanel(Static):
             text += "[i](No output)[/i]"
         self.update(text)
 
-    def show_code(self, code: str, path: Path, language: str) -> None:
+    @staticmethod
+    def build_code_renderable(code: str, path: Path, language: str) -> RenderableType:
+        """
+        Build the header + syntax-highlighted body shown by show_code.
+
+        All lexing happens here, so the result is cheap to render and safe
+        to build off the UI thread.
+        """
         header = Text(f"[{language.upper()}] {path.name}", style="bold magenta")
         try:
-            syntax = Syntax(
-                code,
-                language,
-                theme="monokai",
-                line_numbers=True,
-                word_wrap=False,
-            )
-            renderable = Group(header, Text("\n"), syntax)
+            body = _RenderedText(_highlight_code(code, language))
+            return Group(header, Text("\n"), body)
         except Exception:
             body = Text(code)
-            renderable = Group(header, Text("\n"), body)
+            return Group(header, Text("\n"), body)
+
+    @staticmethod
+    def build_plain_renderable(text: str, path: Path, note: str) -> RenderableType:
+        """Build an unhighlighted preview with a short explanatory header."""
+        header = Text(f"[TEXT] {path.name} ({note})", style="bold magenta")
+        return Group(header, Text("\n"), Text(text))
+
+    def show_code(self, code: str, path: Path, language: str) -> None:
+        self.show_code_renderable(self.build_code_renderable(code, path, language))
 
+    def show_code_renderable(self, renderable: RenderableType) -> None:
+        """Display a code preview previously built by build_code_renderable."""
+        self._last_code = renderable
         self.update(renderable)
 
-    def show_hexdump(self, dump: str, path: Path) -> None:
+    def redisplay(self) -> bool:
+        """Re-attach the last code preview; False if there is none."""
+        if self._last_code is None:
+            return False
+        self.update(self._last_code)
+        return True
+
+    @staticmethod
+    def build_hexdump_renderable(dump: str, path: Path) -> RenderableType:
+        """Build the hex preview renderable (safe to call off the UI thread)."""
         header = Text(
             f"[BINARY] {path.name} (hex preview, first bytes)",
             style="bold yellow",
         )
         try:
-            syntax = Syntax(
-                dump,
-                "asm",
-                theme="monokai",
-                line_numbers=False,
-                word_wrap=False,
-            )
-            renderable = Group(header, Text("\n"), syntax)
+            body = _RenderedText(_highlight_code(dump, "asm", line_numbers=False))
+            return Group(header, Text("\n"), body)
         except Exception:
             body = Text(dump)
-            renderable = Group(header, Text("\n"), body)
+            return Group(header, Text("\n"), body)
 
-        self.update(renderable)
+    def show_hexdump(self, dump: str, path: Path) -> None:
+        self.update(self.build_hexdump_renderable(dump, path))
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import os
+import stat as statmod
 from pathlib import Path
+from typing import Optional
 
 # Map basic ANSI color codes to Rich/Textual color names
 _ANSI_COLOR_MAP = {
@@ -35,7 +37,7 @@ def _ansi_to_style(code_str: str) -> str:
     style_bits: list[str] = []
 
     for p in parts:
-        if p == "1":
+        if p in ("1", "01"):
             style_bits.append("bold")
         elif p in _ANSI_COLOR_MAP:
             style_bits.append(_ANSI_COLOR_MAP[p])
@@ -43,57 +45,88 @@ def _ansi_to_style(code_str: str) -> str:
     return " ".join(style_bits)
 
 
-def _parse_ls_colors() -> dict[str, str]:
+def _parse_ls_colors() -> tuple[dict[str, str], dict[str, str]]:
     """
-    Parse $LS_COLORS into a simple mapping:
-        { 'di': 'bold blue', 'ln': 'bold cyan', ... }
-    We ignore extension patterns (e.g. '*.py') for now.
+    Parse $LS_COLORS into two simple mappings:
+        types:    { 'di': 'bold blue', 'ln': 'bold cyan', ... }
+        suffixes: { '.py': 'yellow', '.tar': 'bold red', ... }
+    Only '*.ext' patterns are kept as suffixes.
     """
     env = os.environ.get("LS_COLORS", "")
-    result: dict[str, str] = {}
+    types: dict[str, str] = {}
+    suffixes: dict[str, str] = {}
 
     if not env:
-        return result
+        return types, suffixes
+
+    # Identical style strings share one object across all entries
+    interned: dict[str, str] = {}
 
     for chunk in env.split(":"):
         if "=" not in chunk:
             continue
         key, val = chunk.split("=", 1)
-        # Only handle simple types like 'di', 'ln', 'ex' for now.
-        if key and not key.startswith("*."):
-            style = _ansi_to_style(val)
-            if style:
-                result[key] = style
+        style = _ansi_to_style(val)
+        if not key or not style:
+            continue
+        style = interned.setdefault(style, style)
+        if key.startswith("*."):
+            suffixes[key[1:]] = style
+        elif not key.startswith("*"):
+            types[key] = style
+
+    return types, suffixes
 
-    return result
 
+# Parsed once at import; style_for_path only does dict lookups
+_LS_COLORS_MAP, _SUFFIX_STYLES = _parse_ls_colors()
+_DIR_STYLE = _LS_COLORS_MAP.get("di", "bold blue")
+_LINK_STYLE = _LS_COLORS_MAP.get("ln", "cyan")
+_EXEC_STYLE = _LS_COLORS_MAP.get("ex", "bold green")
 
-_LS_COLORS_MAP = _parse_ls_colors()
 
+def _suffix_style(name: str) -> str:
+    dot = name.rfind(".")
+    if dot <= 0:
+        return ""
+    return _SUFFIX_STYLES.get(name[dot:], "")
 
-def style_for_path(path: Path) -> str:
+
+def style_for_path(
+    path: Path, mode: Optional[int] = None, is_link: Optional[bool] = None
+) -> str:
     """
     Return a Rich/Textual style string for this path based on LS_COLORS,
     with sensible fallbacks for directories (and a couple of extras).
+
+    Callers that already have the entry's stat() mode (and whether it is a
+    symlink) can pass them to skip the filesystem checks.
     """
+    if mode is not None:
+        if statmod.S_ISDIR(mode):
+            return _DIR_STYLE
+        if is_link if is_link is not None else path.is_symlink():
+            return _LINK_STYLE
+        if statmod.S_ISREG(mode):
+            if mode & 0o111:
+                return _EXEC_STYLE
+            return _suffix_style(path.name)
+        return ""
+
     # Directories
     if path.is_dir():
-        if "di" in _LS_COLORS_MAP:
-            return _LS_COLORS_MAP["di"]
-        return "bold blue"
+        return _DIR_STYLE
 
     # Symlinks
     if path.is_symlink():
-        if "ln" in _LS_COLORS_MAP:
-            return _LS_COLORS_MAP["ln"]
-        return "cyan"
+        return _LINK_STYLE
 
     # Executables
     try:
-        if path.is_file() and os.access(path, os.X_OK):
-            if "ex" in _LS_COLORS_MAP:
-                return _LS_COLORS_MAP["ex"]
-            return "bold green"
+        if path.is_file():
+            if os.access(path, os.X_OK):
+                return _EXEC_STYLE
+            return _suffix_style(path.name)
     except Exception:
         pass
 
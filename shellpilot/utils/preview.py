@@ -1,7 +1,10 @@
 # shellpilot/utils/preview.py
 from __future__ import annotations
 from pathlib import Path
+from collections import deque
+from functools import lru_cache
 from typing import Optional, Iterable
+import io
 import os
 import bz2
 import gzip
@@ -10,10 +13,15 @@ import lzma
 from rich.console import Group
 from rich.text import Text
 
-try:
-    from PIL import Image as PILImage
-except ImportError:
-    PILImage = None
+
+@lru_cache(maxsize=1)
+def _pil_image():
+    """Return PIL.Image, imported on the first image preview (None if missing)."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
 
 
 LOG_SUFFIXES = {".log", ".journal"}  # “text” log-ish suffixes
@@ -45,53 +53,44 @@ def is_text_file(path: Path) -> bool:
     return sfx in TEXT_SUFFIXES or is_code_file(path)
 
 
-def language_for_path(path: Path) -> Optional[str]:
-    """Map file extensions to Rich/pygments lexer names."""
-    suffix = path.suffix.lower()
-
+# Extension -> Rich/pygments lexer name
+_SUFFIX_LANGUAGES: dict[str, str] = {
     # Code-ish
-    if suffix == ".py":
-        return "python"
-    if suffix in {".sh", ".bash"}:
-        return "bash"
-    if suffix == ".js":
-        return "javascript"
-    if suffix == ".ts":
-        return "typescript"
-    if suffix == ".rs":
-        return "rust"
-    if suffix == ".go":
-        return "go"
-    if suffix == ".c":
-        return "c"
-    if suffix in {".cpp", ".cc", ".cxx"}:
-        return "cpp"
-
+    ".py": "python",
+    ".sh": "bash",
+    ".bash": "bash",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".rs": "rust",
+    ".go": "go",
+    ".c": "c",
+    ".cpp": "cpp",
+    ".cc": "cpp",
+    ".cxx": "cpp",
     # Config / data
-    if suffix == ".json":
-        return "json"
-    if suffix in {".yml", ".yaml"}:
-        return "yaml"
-    if suffix == ".toml":
-        return "toml"
-    if suffix in {".ini", ".cfg", ".conf"}:
-        return "ini"
-
+    ".json": "json",
+    ".yml": "yaml",
+    ".yaml": "yaml",
+    ".toml": "toml",
+    ".ini": "ini",
+    ".cfg": "ini",
+    ".conf": "ini",
     # Markup / docs
-    if suffix in {".md", ".markdown"}:
-        return "markdown"
-    if suffix in {".html", ".htm"}:
-        return "html"
-    if suffix == ".css":
-        return "css"
-
+    ".md": "markdown",
+    ".markdown": "markdown",
+    ".html": "html",
+    ".htm": "html",
+    ".css": "css",
     # Plain-ish text
-    if suffix in {".txt", ".log"}:
-        return "text"
-    if suffix == ".csv":
-        return "csv"
+    ".txt": "text",
+    ".log": "text",
+    ".csv": "csv",
+}
 
-    return None
+
+def language_for_path(path: Path) -> Optional[str]:
+    """Map file extensions to Rich/pygments lexer names."""
+    return _SUFFIX_LANGUAGES.get(path.suffix.lower())
 
 
 def pillow_rich_image(path: Path, max_width_chars: int = 40) -> Optional[Group]:
@@ -100,11 +99,15 @@ def pillow_rich_image(path: Path, max_width_chars: int = 40) -> Optional[Group]:
 
     Uses background-colored spaces as pixels. max_width_chars controls horizontal size.
     """
+    PILImage = _pil_image()
     if PILImage is None:
         return None
 
     try:
-        img = PILImage.open(path).convert("RGB")
+        img = PILImage.open(path)
+        # JPEGs can be decoded at 1/2../1/8 scale, skipping most of the pixels
+        img.draft("RGB", (max_width_chars, max_width_chars))
+        img = img.convert("RGB")
     except Exception:
         return None
 
@@ -130,6 +133,13 @@ def pillow_rich_image(path: Path, max_width_chars: int = 40) -> Optional[Group]:
     return Group(header, Text("\n"), *lines)
 
 
+# Bytes that count as "text" when sniffing (same set as file(1)): printable
+# ASCII, common control characters, and anything >= 0x80 so UTF-8 passes
+_TEXT_BYTES = bytes(
+    {7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x7F)) | set(range(0x80, 0x100))
+)
+
+
 def is_binary_file(path: Path, sample_size: int = 2048) -> bool:
     """Heuristic: decide if a file is binary by sampling bytes."""
     try:
@@ -138,37 +148,46 @@ def is_binary_file(path: Path, sample_size: int = 2048) -> bool:
     except Exception:
         return False
 
+    return looks_binary(chunk)
+
+
+def looks_binary(chunk: bytes) -> bool:
+    """Binary heuristic on an already-read sample (see is_binary_file)."""
     if not chunk:
         return False
 
     if b"\x00" in chunk:
         return True
 
-    text_bytes = set(range(32, 127)) | {9, 10, 13}
-    nontext = sum(1 for b in chunk if b not in text_bytes)
-
+    nontext = len(chunk.translate(None, _TEXT_BYTES))
     return nontext / len(chunk) > 0.30
 
 
+# Maps every byte to itself if printable ASCII, else to "."
+_HEX_ASCII_TABLE = bytes(b if 32 <= b < 127 else 46 for b in range(256))
+
+
 def hex_dump(path: Path, max_bytes: int = 4096) -> str:
     """Produce a classic hex+ASCII dump of the first max_bytes of the file."""
     try:
         with path.open("rb") as f:
-            data = f.read(max_bytes)
+            # One byte past the window tells us whether anything was cut off
+            data = f.read(max_bytes + 1)
     except Exception as e:
         return f"<< Failed to read file for hex dump: {e} >>"
 
+    truncated = len(data) > max_bytes
+    data = data[:max_bytes]
     lines: list[str] = []
     length = len(data)
 
     for offset in range(0, length, 16):
         chunk = data[offset : offset + 16]
-        hex_bytes = " ".join(f"{b:02x}" for b in chunk)
-        hex_bytes = hex_bytes.ljust(16 * 3 - 1)
-        ascii_part = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+        hex_bytes = chunk.hex(" ").ljust(16 * 3 - 1)
+        ascii_part = chunk.translate(_HEX_ASCII_TABLE).decode("ascii")
         lines.append(f"{offset:08x}  {hex_bytes}  |{ascii_part}|")
 
-    if length == max_bytes:
+    if truncated:
         lines.append(f"... truncated at {max_bytes} bytes ...")
 
     return "\n".join(lines)
@@ -201,6 +220,53 @@ def is_log_file(path: Path) -> bool:
     return False
 
 
+def _open_log_binary(path: Path):
+    """Open a (possibly compressed) log file for binary line iteration."""
+    suffixes = [s.lower() for s in path.suffixes]
+    last = suffixes[-1] if suffixes else ""
+
+    if last == ".gz":
+        return gzip.open(path, "rb")
+    if last in {".xz", ".lzma"}:
+        return lzma.open(path, "rb")
+    if last == ".bz2":
+        return bz2.open(path, "rb")
+    return None
+
+
+def read_log_tail(
+    path: Path, n_lines: int = 500, max_bytes: int = 512 * 1024
+) -> deque[str]:
+    """
+    Return the last n_lines of a (possibly compressed) log file.
+
+    Plain files are read from at most max_bytes before EOF, so memory stays
+    bounded regardless of log size. Compressed files can't seek, so they are
+    streamed line by line as bytes; only the kept tail is decoded.
+    """
+    compressed = _open_log_binary(path)
+    if compressed is not None:
+        with compressed as f:
+            tail = deque(f, maxlen=n_lines)
+        text = b"".join(tail).decode("utf-8", errors="replace")
+        return deque(io.StringIO(text), maxlen=n_lines)
+
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        offset = max(0, size - max_bytes)
+        if offset:
+            f.seek(offset)
+        data = f.read(max_bytes)
+
+    if offset:
+        # Drop the partial line we landed in the middle of
+        data = data[data.find(b"\n") + 1:] if b"\n" in data else b""
+
+    # One decode for the whole tail; StringIO splits on "\n" only, like a file
+    text = data.decode("utf-8", errors="replace")
+    return deque(io.StringIO(text), maxlen=n_lines)
+
+
 def read_log_text(path: Path, max_bytes: int = 512 * 1024) -> str:
     """
     Read up to max_bytes of a (possibly compressed) log file as text.
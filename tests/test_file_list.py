@@ -0,0 +1,64 @@
+import asyncio
+from pathlib import Path
+
+from textual.app import App
+
+from shellpilot.core.search import SearchMode, SearchQuery
+from shellpilot.ui.widgets import FileList
+
+
+def _shown_names(file_list: FileList, root: Path) -> set[str]:
+    names = set()
+    for item in file_list.children:
+        path = Path(getattr(item, "data", ""))
+        if path.parent == root:
+            names.add(path.name)
+    return names
+
+
+def _search(tmp_path: Path, steps: list[tuple[SearchMode, str]]) -> list[set[str]]:
+    """Run queries in order against one FileList; return names shown after each."""
+
+    class _App(App):
+        def compose(self):
+            yield FileList(tmp_path)
+
+    results: list[set[str]] = []
+
+    async def run() -> None:
+        app = _App()
+        async with app.run_test() as pilot:
+            file_list = app.query_one(FileList)
+            for mode, text in steps:
+                file_list.set_search_query(SearchQuery(text=text, mode=mode))
+                await pilot.pause()
+                results.append(_shown_names(file_list, tmp_path))
+
+    asyncio.run(run())
+    return results
+
+
+def test_fuzzy_retyping_after_backspace_keeps_matches(tmp_path):
+    (tmp_path / "readme.md").write_text("")
+    (tmp_path / "other.txt").write_text("")
+
+    fuzzy = SearchMode.FUZZY
+    first, shorter, retyped = _search(
+        tmp_path, [(fuzzy, "rdme"), (fuzzy, "rd"), (fuzzy, "rdme")]
+    )
+
+    assert "readme.md" in first
+    assert "readme.md" not in shorter
+    assert retyped == first
+
+
+def test_plain_substring_narrowing_matches_fresh_search(tmp_path):
+    for name in ("alpha.py", "alpine.txt", "beta.py"):
+        (tmp_path / name).write_text("")
+
+    plain = SearchMode.PLAIN
+    narrowed = _search(tmp_path, [(plain, "al"), (plain, "alp"), (plain, "alph")])
+    fresh = _search(tmp_path, [(plain, "alph")])
+
+    assert narrowed[0] == {"alpha.py", "alpine.txt"}
+    assert narrowed[-1] == fresh[0] == {"alpha.py"}
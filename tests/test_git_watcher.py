@@ -0,0 +1,36 @@
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("watchdog")
+
+from shellpilot.core.git_watcher import GitWatcher
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def test_git_add_outside_the_app_fires_a_change(tmp_path: Path) -> None:
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "new.txt").write_text("hello\n")
+
+    changed = threading.Event()
+    watcher = GitWatcher(changed.set)
+    watcher.watch(tmp_path)
+    try:
+        # Let the watch settle, then drop anything from setting it up
+        time.sleep(0.2)
+        changed.clear()
+
+        # Staging only touches .git: index.lock is written, then renamed to index
+        _git(tmp_path, "add", "new.txt")
+        assert changed.wait(5.0)
+    finally:
+        watcher.stop()